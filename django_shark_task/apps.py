@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class DjangoSharkTaskConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "django_shark_task"
+
+    def ready(self):
+        import django_shark_task.task.signals  # noqa: F401
+        import django_shark_task.workflow.signals  # noqa: F401
@@ -1,8 +1,6 @@
-import logging
-
-import jsonschema
 from django.db import models
-from jsonschema.exceptions import ValidationError
+
+from django_shark_task.utils.json_schema import validate
 
 
 class FieldType(models.Model):
@@ -12,6 +10,25 @@ class FieldType(models.Model):
     created = models.DateTimeField(auto_now_add=True)
     updated = models.DateTimeField(auto_now=True)
 
+    def validate_config(self, config) -> None:
+        if self.config_schema:
+            validate(
+                config,
+                ("field_type_config", self.pk) if self.pk else None,
+                self.config_schema,
+                self.updated,
+                "Invalid config schema",
+            )
+
+    def validate_value(self, value) -> None:
+        validate(
+            value,
+            ("field_type_value", self.pk) if self.pk else None,
+            self.value_schema,
+            self.updated,
+            "Invalid field value schema",
+        )
+
 
 class Field(models.Model):
     key = models.CharField(max_length=256, unique=True)
@@ -23,15 +40,7 @@ class Field(models.Model):
     updated = models.DateTimeField(auto_now=True)
 
     def save(self, *args, **kwargs):
-        config_schema = self.field_type.config_schema
-        if config_schema:
-            try:
-                jsonschema.validate(self.config, config_schema)
-            except ValidationError as e:
-                logger = logging.getLogger()
-                logger.error(e)
-                print(e)
-                raise ValueError("Invalid config schema")
+        self.field_type.validate_config(self.config)
         return super().save(*args, **kwargs)
 
 
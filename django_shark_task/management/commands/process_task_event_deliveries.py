@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from django_shark_task.task.event_dispatcher import task_event_dispatcher
+
+
+class Command(BaseCommand):
+    help = "Deliver pending task events to event listeners"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--sleep", type=float, default=1.0)
+        parser.add_argument("--once", action="store_true")
+
+    def handle(self, *args, **options):
+        while True:
+            delivered_count = task_event_dispatcher.process_pending(options["batch_size"])
+            if options["once"]:
+                self.stdout.write(f"Delivered {delivered_count} task event deliveries")
+                return
+            if not delivered_count:
+                time.sleep(options["sleep"])
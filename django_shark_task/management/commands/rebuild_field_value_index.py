@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from django_shark_task.task.field_value_index import field_value_indexer
+from django_shark_task.task.models import FieldValue
+
+
+class Command(BaseCommand):
+    help = "Rebuild the typed field value index used to filter tasks by custom fields"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        indexed_count = 0
+        last_pk = 0
+        while True:
+            field_values = list(
+                FieldValue.objects.select_related("field__field_type")
+                .filter(pk__gt=last_pk)
+                .order_by("pk")[: options["batch_size"]]
+            )
+            if not field_values:
+                break
+            with transaction.atomic():
+                field_value_indexer.reindex(field_values)
+            indexed_count += len(field_values)
+            last_pk = field_values[-1].pk
+        self.stdout.write(f"Indexed {indexed_count} field values")
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from django_shark_task.task.models import Task
+from django_shark_task.task.search import task_search_indexer
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index over task summaries and text fields"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        indexed_count = 0
+        last_pk = 0
+        while True:
+            tasks = list(Task.objects.filter(pk__gt=last_pk).order_by("pk")[: options["batch_size"]])
+            if not tasks:
+                break
+            with transaction.atomic():
+                task_search_indexer.reindex(tasks)
+            indexed_count += len(tasks)
+            last_pk = tasks[-1].pk
+        self.stdout.write(f"Indexed {indexed_count} tasks")
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from django_shark_task.task.models import Task
+from django_shark_task.task.task_manager import TaskManager
+
+
+class Command(BaseCommand):
+    help = "Rebuild denormalized task snapshots served by the task read endpoints"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        task_manager = TaskManager()
+        refreshed_count = 0
+        last_pk = 0
+        while True:
+            task_ids = list(
+                Task.objects.filter(pk__gt=last_pk).order_by("pk").values_list("pk", flat=True)[: options["batch_size"]]
+            )
+            if not task_ids:
+                break
+            task_manager.rebuild_snapshots(task_ids)
+            refreshed_count += len(task_ids)
+            last_pk = task_ids[-1]
+        self.stdout.write(f"Refreshed {refreshed_count} task snapshots")
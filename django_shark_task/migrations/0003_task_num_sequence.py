@@ -0,0 +1,51 @@
+# Generated by Django 4.2.4 on 2026-10-18 14:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.migrations import RunPython
+from django.db.models import Max
+
+
+def create_task_num_sequences(apps, schema_editor):
+    Task = apps.get_model("django_shark_task", "Task")
+    TaskNumSequence = apps.get_model("django_shark_task", "TaskNumSequence")
+    max_task_num_info_list = Task.objects.values("project_schema__project_id").annotate(max_task_num=Max("task_num"))
+    TaskNumSequence.objects.bulk_create(
+        [
+            TaskNumSequence(
+                project_id=max_task_num_info["project_schema__project_id"],
+                last_task_num=max_task_num_info["max_task_num"],
+            )
+            for max_task_num_info in max_task_num_info_list
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_shark_task", "0002_create_base_entities"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskNumSequence",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("last_task_num", models.IntegerField(default=0)),
+                ("updated", models.DateTimeField(auto_now=True)),
+                (
+                    "project",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="task_num_sequence",
+                        to="django_shark_task.project",
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunPython(
+            create_task_num_sequences,
+            reverse_code=RunPython.noop,
+        ),
+    ]
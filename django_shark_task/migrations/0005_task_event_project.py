@@ -0,0 +1,38 @@
+# Generated by Django 4.2.4 on 2026-10-18 14:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.migrations import RunPython
+from django.db.models import OuterRef, Subquery
+
+
+def fill_task_event_projects(apps, schema_editor):
+    Task = apps.get_model("django_shark_task", "Task")
+    TaskEvent = apps.get_model("django_shark_task", "TaskEvent")
+    TaskEvent.objects.filter(project__isnull=True).update(
+        project_id=Subquery(Task.objects.filter(pk=OuterRef("task_id")).values("project_schema__project_id")[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_shark_task", "0004_task_event_delivery"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="taskevent",
+            name="project",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="task_events",
+                to="django_shark_task.project",
+            ),
+        ),
+        migrations.RunPython(
+            fill_task_event_projects,
+            reverse_code=RunPython.noop,
+        ),
+    ]
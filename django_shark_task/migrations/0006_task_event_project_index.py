@@ -0,0 +1,25 @@
+# Generated by Django 4.2.4 on 2026-10-18 14:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_shark_task", "0005_task_event_project"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="taskevent",
+            name="project",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.PROTECT, related_name="task_events", to="django_shark_task.project"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="taskevent",
+            index=models.Index(fields=["project", "id"], name="django_shar_project_7d9506_idx"),
+        ),
+    ]
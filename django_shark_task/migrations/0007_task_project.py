@@ -0,0 +1,38 @@
+# Generated by Django 4.2.4 on 2026-10-18 14:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.migrations import RunPython
+from django.db.models import OuterRef, Subquery
+
+
+def fill_task_projects(apps, schema_editor):
+    ProjectSchema = apps.get_model("django_shark_task", "ProjectSchema")
+    Task = apps.get_model("django_shark_task", "Task")
+    Task.objects.filter(project__isnull=True).update(
+        project_id=Subquery(ProjectSchema.objects.filter(pk=OuterRef("project_schema_id")).values("project_id")[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_shark_task", "0006_task_event_project_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="project",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="tasks",
+                to="django_shark_task.project",
+            ),
+        ),
+        migrations.RunPython(
+            fill_task_projects,
+            reverse_code=RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.4 on 2026-10-18 14:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_shark_task", "0007_task_project"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="task",
+            name="project",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.PROTECT, related_name="tasks", to="django_shark_task.project"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["project", "created", "id"], name="django_shar_project_8b98d8_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["project_schema", "created", "id"], name="django_shar_project_27899f_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="taskevent",
+            index=models.Index(fields=["task", "created", "id"], name="django_shar_task_id_c094df_idx"),
+        ),
+    ]
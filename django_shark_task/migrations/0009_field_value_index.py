@@ -0,0 +1,54 @@
+# Generated by Django 4.2.4 on 2026-10-18 14:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_shark_task", "0008_task_access_path_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FieldValueIndex",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("int_value", models.BigIntegerField(null=True)),
+                ("str_value", models.CharField(max_length=255, null=True)),
+                ("user_value", models.IntegerField(null=True)),
+                (
+                    "field",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="field_value_index_entries",
+                        to="django_shark_task.field",
+                    ),
+                ),
+                (
+                    "field_value",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="index_entries",
+                        to="django_shark_task.fieldvalue",
+                    ),
+                ),
+                (
+                    "task",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="field_value_index_entries",
+                        to="django_shark_task.task",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["field", "int_value", "task"], name="django_shar_field_i_a6bc1b_idx"),
+                    models.Index(fields=["field", "str_value", "task"], name="django_shar_field_i_6b382d_idx"),
+                    models.Index(fields=["field", "user_value", "task"], name="django_shar_field_i_6c6f25_idx"),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 4.2.4 on 2026-10-18 14:54
+
+import django.db.models.deletion
+from django.db import OperationalError, migrations, models
+
+DOCUMENT_TABLE = "django_shark_task_tasksearchdocument"
+SQLITE_SEARCH_TABLE = "django_shark_task_tasksearchdocument_fts"
+POSTGRESQL_SEARCH_INDEX = "django_shark_task_tasksearchdocument_content_gin"
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        try:
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE {SQLITE_SEARCH_TABLE} USING fts5("
+                f"content, content='{DOCUMENT_TABLE}', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+            )
+        except OperationalError:
+            return
+        schema_editor.execute(
+            f"CREATE TRIGGER {SQLITE_SEARCH_TABLE}_ai AFTER INSERT ON {DOCUMENT_TABLE} BEGIN "
+            f"INSERT INTO {SQLITE_SEARCH_TABLE}(rowid, content) VALUES (new.id, new.content); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {SQLITE_SEARCH_TABLE}_ad AFTER DELETE ON {DOCUMENT_TABLE} BEGIN "
+            f"INSERT INTO {SQLITE_SEARCH_TABLE}({SQLITE_SEARCH_TABLE}, rowid, content) "
+            "VALUES ('delete', old.id, old.content); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {SQLITE_SEARCH_TABLE}_au AFTER UPDATE ON {DOCUMENT_TABLE} BEGIN "
+            f"INSERT INTO {SQLITE_SEARCH_TABLE}({SQLITE_SEARCH_TABLE}, rowid, content) "
+            "VALUES ('delete', old.id, old.content); "
+            f"INSERT INTO {SQLITE_SEARCH_TABLE}(rowid, content) VALUES (new.id, new.content); END"
+        )
+    elif vendor == "postgresql":
+        schema_editor.execute(
+            f"CREATE INDEX {POSTGRESQL_SEARCH_INDEX} ON {DOCUMENT_TABLE} USING GIN (to_tsvector('simple', content))"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        for suffix in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {SQLITE_SEARCH_TABLE}_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {SQLITE_SEARCH_TABLE}")
+    elif vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {POSTGRESQL_SEARCH_INDEX}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_shark_task", "0009_field_value_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskSearchDocument",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("content", models.TextField()),
+                ("updated", models.DateTimeField(auto_now=True)),
+                (
+                    "project",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="task_search_documents",
+                        to="django_shark_task.project",
+                    ),
+                ),
+                (
+                    "project_schema",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="task_search_documents",
+                        to="django_shark_task.projectschema",
+                    ),
+                ),
+                (
+                    "task",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_document",
+                        to="django_shark_task.task",
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunPython(
+            create_search_index,
+            reverse_code=drop_search_index,
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.4 on 2026-10-18 14:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_shark_task", "0010_task_search_document"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskSnapshot",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("data", models.JSONField()),
+                ("updated", models.DateTimeField(auto_now=True)),
+                (
+                    "project_schema",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="task_snapshots",
+                        to="django_shark_task.projectschema",
+                    ),
+                ),
+                (
+                    "task",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="snapshot",
+                        to="django_shark_task.task",
+                    ),
+                ),
+            ],
+        ),
+    ]
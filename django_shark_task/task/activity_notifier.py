@@ -0,0 +1,80 @@
+import asyncio
+import threading
+from typing import Iterable
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from django_shark_task.task.const import PROJECT_ACTIVITY_POLL_INTERVAL
+from django_shark_task.task.models import TaskEvent
+
+
+class ActivityNotifier:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version_storage: dict[int, int] = {}
+        self._waiter_storage: dict[int, set[tuple[asyncio.AbstractEventLoop, asyncio.Event]]] = {}
+
+    async def get_version(self, project_id: int) -> int:
+        if shared_cache := self._get_shared_cache():
+            return await shared_cache.aget(self._get_version_key(project_id), 0)
+        with self._lock:
+            return self._version_storage.get(project_id, 0)
+
+    def notify(self, project_ids: Iterable[int]) -> None:
+        waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = []
+        with self._lock:
+            for project_id in project_ids:
+                self._version_storage[project_id] = self._version_storage.get(project_id, 0) + 1
+                waiters.extend(self._waiter_storage.get(project_id, ()))
+        if shared_cache := self._get_shared_cache():
+            for project_id in project_ids:
+                try:
+                    shared_cache.incr(self._get_version_key(project_id))
+                except ValueError:
+                    shared_cache.set(self._get_version_key(project_id), 1, timeout=None)
+        for loop, event in waiters:
+            loop.call_soon_threadsafe(event.set)
+
+    def notify_on_commit(self, task_events: list[TaskEvent]) -> None:
+        project_ids = {task_event.project_id for task_event in task_events}
+        if project_ids:
+            transaction.on_commit(lambda: self.notify(project_ids))
+
+    async def wait(self, project_id: int, version: int, timeout: float) -> bool:
+        # Notifications from this process wake waiters at once and other processes are seen through the shared cache
+        # version, checked every poll interval. Without the shared cache other processes cannot be seen, so True is
+        # also returned after each poll interval to make the caller query again.
+        loop = asyncio.get_running_loop()
+        waiter = (loop, asyncio.Event())
+        with self._lock:
+            self._waiter_storage.setdefault(project_id, set()).add(waiter)
+        try:
+            deadline = loop.time() + timeout
+            while await self.get_version(project_id) == version:
+                if (timeout := deadline - loop.time()) <= 0:
+                    return False
+                try:
+                    await asyncio.wait_for(waiter[1].wait(), min(timeout, PROJECT_ACTIVITY_POLL_INTERVAL))
+                except asyncio.TimeoutError:
+                    if self._get_shared_cache() is None:
+                        return True
+                waiter[1].clear()
+            return True
+        finally:
+            with self._lock:
+                self._waiter_storage[project_id].discard(waiter)
+                if not self._waiter_storage[project_id]:
+                    del self._waiter_storage[project_id]
+
+    def _get_version_key(self, project_id: int) -> str:
+        return f"shark_task:activity:{project_id}:version"
+
+    def _get_shared_cache(self):
+        if cache_alias := getattr(settings, "SHARK_TASK_ACTIVITY_CACHE", None):
+            return caches[cache_alias]
+        return None
+
+
+activity_notifier = ActivityNotifier()
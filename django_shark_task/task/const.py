@@ -8,6 +8,55 @@ TASK_EVENT_LISTENERS_JSON_SCHEMA = {
             "args": {"type": "array"},
             "kwargs": {"type": "object"},
             "priority": {"type": "integer"},
+            "max_concurrency": {"type": "integer", "minimum": 1},
         },
     },
 }
+
+DEFAULT_TASK_PAGE_SIZE = 100
+MAX_TASK_PAGE_SIZE = 500
+
+DEFAULT_TASK_EVENT_PAGE_SIZE = 100
+MAX_TASK_EVENT_PAGE_SIZE = 500
+TASK_EVENT_STREAM_CHUNK_SIZE = 1000
+MAX_PROJECT_ACTIVITY_WAIT = 30
+PROJECT_ACTIVITY_POLL_INTERVAL = 1
+PROJECT_ACTIVITY_SETTLE_TIME = 2
+
+MAX_BULK_TASK_COUNT = 10000
+MAX_BATCH_TASK_COUNT = 500
+MAX_BULK_LINK_COUNT = 1000
+
+USER_GROUP_IDS_CACHE_TIMEOUT = 60
+METADATA_CACHE_MAX_AGE = 60
+METADATA_CACHE_LOCAL_TIMEOUT = 30
+METADATA_CACHE_VERSION_TIMEOUT = 1
+
+FIELD_VALUE_INDEX_STR_MAX_LENGTH = 255
+
+DEFAULT_LINK_GRAPH_DEPTH = 3
+MAX_LINK_GRAPH_DEPTH = 10
+DEFAULT_LINK_GRAPH_NODE_COUNT = 200
+MAX_LINK_GRAPH_NODE_COUNT = 1000
+
+
+class LinkDirection:
+    OUTWARD = "outward"
+    INWARD = "inward"
+    BOTH = "both"
+    CHOICES = (
+        (OUTWARD, OUTWARD),
+        (INWARD, INWARD),
+        (BOTH, BOTH),
+    )
+
+
+SEARCH_FIELD_TYPE_KEYS = ("string", "text")
+DEFAULT_TASK_SEARCH_PAGE_SIZE = 20
+MAX_TASK_SEARCH_PAGE_SIZE = 100
+
+DEFAULT_EVENT_DISPATCH_WORKERS = 4
+DEFAULT_EVENT_LISTENER_MAX_CONCURRENCY = 4
+EVENT_DELIVERY_MAX_ATTEMPTS = 5
+EVENT_DELIVERY_RETRY_DELAY = 10
+EVENT_DELIVERY_PROCESSING_TIMEOUT = 300
@@ -0,0 +1,170 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from django_shark_task.task.const import (
+    DEFAULT_EVENT_DISPATCH_WORKERS,
+    DEFAULT_EVENT_LISTENER_MAX_CONCURRENCY,
+    EVENT_DELIVERY_MAX_ATTEMPTS,
+    EVENT_DELIVERY_PROCESSING_TIMEOUT,
+    EVENT_DELIVERY_RETRY_DELAY,
+)
+from django_shark_task.task.models import (
+    Task,
+    TaskEvent,
+    TaskEventDelivery,
+    TaskEventDeliveryStatus,
+)
+from django_shark_task.utils.plugins import create_plugin_instance
+from django_shark_task.utils.utils import notify_event_listener
+
+User = get_user_model()
+
+logger = logging.getLogger(__name__)
+
+
+class TaskEventDispatcher:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore_storage: dict[str, threading.BoundedSemaphore] = {}
+
+    def enqueue(
+        self,
+        task_events: list[TaskEvent],
+        user: User,
+        event_listener_info_list: Optional[list[dict]],
+    ) -> list[TaskEventDelivery]:
+        if not event_listener_info_list or not task_events:
+            return []
+
+        task_event_ids = [task_event.pk for task_event in task_events]
+        deliveries = TaskEventDelivery.objects.bulk_create(
+            [
+                TaskEventDelivery(event_listener=event_listener_info, task_event_ids=task_event_ids, user=user)
+                for event_listener_info in event_listener_info_list
+            ]
+        )
+        delivery_ids = [delivery.pk for delivery in deliveries]
+        transaction.on_commit(lambda: self.dispatch(delivery_ids))
+        return deliveries
+
+    def dispatch(self, delivery_ids: list[int]) -> None:
+        if executor := self._get_executor():
+            for delivery_id in delivery_ids:
+                executor.submit(self._deliver_in_thread, delivery_id)
+
+    def process_pending(self, limit: int) -> int:
+        now = timezone.now()
+        delivery_ids = list(
+            TaskEventDelivery.objects.filter(
+                Q(status=TaskEventDeliveryStatus.PENDING, next_attempt__lte=now)
+                | Q(
+                    status=TaskEventDeliveryStatus.PROCESSING,
+                    updated__lt=now - timedelta(seconds=EVENT_DELIVERY_PROCESSING_TIMEOUT),
+                )
+            )
+            .order_by("next_attempt", "pk")
+            .values_list("pk", flat=True)[:limit]
+        )
+        return sum(1 for delivery_id in delivery_ids if self.deliver(delivery_id))
+
+    def deliver(self, delivery_id: int) -> bool:
+        if not self._claim(delivery_id):
+            return False
+
+        delivery = TaskEventDelivery.objects.select_related("user").get(pk=delivery_id)
+        event_listener_info = delivery.event_listener
+        semaphore = self._get_semaphore(event_listener_info)
+        try:
+            with semaphore:
+                self._notify(delivery)
+        except Exception as e:
+            logger.exception("Task event delivery %s failed", delivery_id)
+            self._fail(delivery, e)
+        else:
+            # Delivered rows are not needed any more, so they are deleted instead of being kept as done.
+            delivery.delete()
+        return True
+
+    def _deliver_in_thread(self, delivery_id: int) -> None:
+        close_old_connections()
+        try:
+            self.deliver(delivery_id)
+        except Exception:
+            logger.exception("Task event delivery %s could not be processed", delivery_id)
+        finally:
+            close_old_connections()
+
+    def _claim(self, delivery_id: int) -> bool:
+        now = timezone.now()
+        return bool(
+            TaskEventDelivery.objects.filter(
+                Q(status=TaskEventDeliveryStatus.PENDING)
+                | Q(
+                    status=TaskEventDeliveryStatus.PROCESSING,
+                    updated__lt=now - timedelta(seconds=EVENT_DELIVERY_PROCESSING_TIMEOUT),
+                ),
+                pk=delivery_id,
+                next_attempt__lte=now,
+            ).update(status=TaskEventDeliveryStatus.PROCESSING, attempts=F("attempts") + 1, updated=now)
+        )
+
+    def _notify(self, delivery: TaskEventDelivery) -> None:
+        task_storage: dict[int, Task] = {}
+        task_events = list(
+            TaskEvent.objects.select_related("task__status__status_type")
+            .filter(pk__in=delivery.task_event_ids)
+            .order_by("pk")
+        )
+        for task_event in task_events:
+            task_storage.setdefault(task_event.task_id, task_event.task)
+
+        event_listener_info = delivery.event_listener
+        event_listener = create_plugin_instance(
+            event_listener_info["class"],
+            event_listener_info.get("args", []),
+            event_listener_info.get("kwargs", {}),
+        )
+        notify_event_listener(event_listener, list(task_storage.values()), task_events, delivery.user)
+
+    def _fail(self, delivery: TaskEventDelivery, error: Exception) -> None:
+        max_attempts = getattr(settings, "SHARK_TASK_EVENT_DELIVERY_MAX_ATTEMPTS", EVENT_DELIVERY_MAX_ATTEMPTS)
+        if delivery.attempts >= max_attempts:
+            delivery.status = TaskEventDeliveryStatus.FAILED
+        else:
+            delivery.status = TaskEventDeliveryStatus.PENDING
+            delivery.next_attempt = timezone.now() + timedelta(
+                seconds=EVENT_DELIVERY_RETRY_DELAY * 2 ** (delivery.attempts - 1)
+            )
+        delivery.error = str(error)
+        delivery.save(update_fields=["status", "next_attempt", "error", "updated"])
+
+    def _get_executor(self) -> Optional[ThreadPoolExecutor]:
+        max_workers = getattr(settings, "SHARK_TASK_EVENT_DISPATCH_WORKERS", DEFAULT_EVENT_DISPATCH_WORKERS)
+        if not max_workers:
+            return None
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="shark_task_events")
+            return self._executor
+
+    def _get_semaphore(self, event_listener_info: dict) -> threading.BoundedSemaphore:
+        class_name = event_listener_info["class"]
+        with self._lock:
+            if class_name not in self._semaphore_storage:
+                self._semaphore_storage[class_name] = threading.BoundedSemaphore(
+                    event_listener_info.get("max_concurrency", DEFAULT_EVENT_LISTENER_MAX_CONCURRENCY)
+                )
+            return self._semaphore_storage[class_name]
+
+
+task_event_dispatcher = TaskEventDispatcher()
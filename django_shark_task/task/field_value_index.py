@@ -0,0 +1,98 @@
+from typing import Optional
+
+from django.db.models import Exists, OuterRef
+
+from django_shark_task.fields.models import Field
+from django_shark_task.task.const import FIELD_VALUE_INDEX_STR_MAX_LENGTH
+from django_shark_task.task.models import FieldValue, FieldValueIndex
+
+INT_VALUE = "int_value"
+STR_VALUE = "str_value"
+USER_VALUE = "user_value"
+
+FIELD_TYPE_INDEX_STORAGE = {
+    "integer": (INT_VALUE, "value"),
+    "string": (STR_VALUE, "value"),
+    "select": (INT_VALUE, "value"),
+    "multi_select": (INT_VALUE, "values"),
+    "user_picker": (USER_VALUE, "value"),
+}
+
+
+class FieldValueIndexer:
+    def is_indexed(self, field: Field) -> bool:
+        return field.field_type.key in FIELD_TYPE_INDEX_STORAGE
+
+    def reindex(self, field_values: list[FieldValue]) -> None:
+        field_values = [field_value for field_value in field_values if self.is_indexed(field_value.field)]
+        if not field_values:
+            return
+        if any(field_value.pk is None for field_value in field_values):
+            field_value_id_storage = {
+                (task_id, field_id): pk
+                for pk, task_id, field_id in FieldValue.objects.filter(
+                    task_id__in={field_value.task_id for field_value in field_values}
+                ).values_list("pk", "task_id", "field_id")
+            }
+            for field_value in field_values:
+                field_value.pk = field_value_id_storage[(field_value.task_id, field_value.field_id)]
+
+        FieldValueIndex.objects.filter(field_value_id__in=[field_value.pk for field_value in field_values]).delete()
+        FieldValueIndex.objects.bulk_create(
+            [
+                field_value_index
+                for field_value in field_values
+                for field_value_index in self._create_field_value_index_list(field_value)
+            ]
+        )
+
+    def get_filters(self, field: Field, value: Optional[dict]) -> Optional[list[Exists]]:
+        if not self.is_indexed(field) or not value:
+            return None
+        column, value_key = FIELD_TYPE_INDEX_STORAGE[field.field_type.key]
+        conditions = []
+        if value_key in value:
+            typed_values = value[value_key] if isinstance(value[value_key], list) else [value[value_key]]
+            conditions.extend(({column: typed_value}, [typed_value]) for typed_value in typed_values)
+        if isinstance(value.get("in"), list):
+            conditions.append(({f"{column}__in": value["in"]}, value["in"]))
+        for lookup in ("gte", "lte"):
+            if lookup in value:
+                conditions.append(({f"{column}__{lookup}": value[lookup]}, [value[lookup]]))
+        if not conditions or not all(
+            self._is_indexable_value(column, typed_value)
+            for _, typed_values in conditions
+            for typed_value in typed_values
+        ):
+            return None
+
+        return [
+            Exists(FieldValueIndex.objects.filter(task_id=OuterRef("pk"), field_id=field.pk, **condition))
+            for condition, _ in conditions
+        ]
+
+    def _create_field_value_index_list(self, field_value: FieldValue) -> list[FieldValueIndex]:
+        column, value_key = FIELD_TYPE_INDEX_STORAGE[field_value.field.field_type.key]
+        typed_values = (field_value.value or {}).get(value_key)
+        if typed_values is None:
+            return []
+        if not isinstance(typed_values, list):
+            typed_values = [typed_values]
+        return [
+            FieldValueIndex(
+                field_value_id=field_value.pk,
+                task_id=field_value.task_id,
+                field_id=field_value.field_id,
+                **{column: typed_value},
+            )
+            for typed_value in dict.fromkeys(typed_values)
+            if self._is_indexable_value(column, typed_value)
+        ]
+
+    def _is_indexable_value(self, column: str, typed_value) -> bool:
+        if column == STR_VALUE:
+            return isinstance(typed_value, str) and len(typed_value) <= FIELD_VALUE_INDEX_STR_MAX_LENGTH
+        return isinstance(typed_value, int) and not isinstance(typed_value, bool)
+
+
+field_value_indexer = FieldValueIndexer()
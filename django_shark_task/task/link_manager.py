@@ -1,33 +1,179 @@
+from typing import Optional
+
 from django.contrib.auth import get_user_model
 from django.db import transaction
+from pydantic.main import BaseModel
 
-from django_shark_task.task.models import Link, Task, TaskEvent, TaskEventType
+from django_shark_task.task.activity_notifier import activity_notifier
+from django_shark_task.task.models import Link, LinkType, Task, TaskEvent, TaskEventType
+from django_shark_task.task.task_manager import TaskManager
 
 User = get_user_model()
 
 
+class CreateLinkInfo(BaseModel):
+    link_type_id: int
+    src_task_id: int
+    dest_task_id: int
+
+
+class BulkLinkResultInfo(BaseModel):
+    index: int
+    id: Optional[int]
+    is_created: bool = False
+    error: Optional[str]
+
+
 class LinkManager:
     def create(self, link_type_id: int, src_task_id: int, dest_task_id: int, user: User) -> Link:
         with transaction.atomic():
+            self._lock_tasks([src_task_id, dest_task_id])
             link = Link.objects.create(link_type_id=link_type_id, src_task_id=src_task_id, dest_task_id=dest_task_id)
-            TaskEvent.objects.create(
+            task_event = TaskEvent.objects.create(
                 task_id=src_task_id,
+                project_id=link.src_task.project_id,
                 type=TaskEventType.LINK_CREATED,
                 user=user,
                 field=self._create_task_info(link.dest_task),
             )
+            activity_notifier.notify_on_commit([task_event])
+            task_manager = TaskManager()
+            task_manager.touch([src_task_id, dest_task_id])
+            task_manager.sync_snapshots([src_task_id, dest_task_id])
             return link
 
     def delete(self, link_id: int, user: User) -> None:
         with transaction.atomic():
             link = Link.objects.select_related("src_task").get(pk=link_id)
             link.delete()
-            TaskEvent.objects.create(
+            task_event = TaskEvent.objects.create(
                 task_id=link.src_task_id,
+                project_id=link.src_task.project_id,
                 type=TaskEventType.LINK_DELETED,
                 user=user,
                 field=self._create_task_info(link.dest_task),
             )
+            activity_notifier.notify_on_commit([task_event])
+            task_manager = TaskManager()
+            task_manager.touch([link.src_task_id, link.dest_task_id])
+            task_manager.sync_snapshots([link.src_task_id, link.dest_task_id])
+
+    def bulk_create(self, link_info_list: list[CreateLinkInfo], user: User) -> list[BulkLinkResultInfo]:
+        result_storage: dict[int, BulkLinkResultInfo] = {}
+        link_type_ids = set(
+            LinkType.objects.filter(pk__in={link_info.link_type_id for link_info in link_info_list}).values_list(
+                "pk", flat=True
+            )
+        )
+
+        with transaction.atomic():
+            task_storage = self._lock_tasks(
+                {link_info.src_task_id for link_info in link_info_list}
+                | {link_info.dest_task_id for link_info in link_info_list}
+            )
+            existing_link_id_storage = {
+                (link_type_id, src_task_id, dest_task_id): link_id
+                for link_id, link_type_id, src_task_id, dest_task_id in Link.objects.filter(
+                    link_type_id__in=link_type_ids,
+                    src_task_id__in=task_storage.keys(),
+                    dest_task_id__in=task_storage.keys(),
+                ).values_list("pk", "link_type_id", "src_task_id", "dest_task_id")
+            }
+
+            link_storage: dict[tuple[int, int, int], Link] = {}
+            index_storage: dict[tuple[int, int, int], list[int]] = {}
+            for index, link_info in enumerate(link_info_list):
+                link_key = (link_info.link_type_id, link_info.src_task_id, link_info.dest_task_id)
+                if link_info.link_type_id not in link_type_ids:
+                    result_storage[index] = BulkLinkResultInfo(
+                        index=index, error=f"Link type with id {link_info.link_type_id} does not exist"
+                    )
+                elif missing_task_ids := [
+                    task_id
+                    for task_id in (link_info.src_task_id, link_info.dest_task_id)
+                    if task_id not in task_storage
+                ]:
+                    result_storage[index] = BulkLinkResultInfo(
+                        index=index, error=f"Tasks {missing_task_ids} do not exist"
+                    )
+                elif link_key in existing_link_id_storage:
+                    result_storage[index] = BulkLinkResultInfo(index=index, id=existing_link_id_storage[link_key])
+                else:
+                    link_storage.setdefault(link_key, Link(**link_info.dict()))
+                    index_storage.setdefault(link_key, []).append(index)
+
+            links = Link.objects.bulk_create(list(link_storage.values()))
+            if any(link.pk is None for link in links):
+                link_id_storage = {
+                    (link_type_id, src_task_id, dest_task_id): link_id
+                    for link_id, link_type_id, src_task_id, dest_task_id in Link.objects.filter(
+                        src_task_id__in={link.src_task_id for link in links}
+                    ).values_list("pk", "link_type_id", "src_task_id", "dest_task_id")
+                }
+                for link_key, link in link_storage.items():
+                    link.pk = link_id_storage[link_key]
+
+            task_events = TaskEvent.objects.bulk_create(
+                [
+                    TaskEvent(
+                        task_id=link.src_task_id,
+                        project_id=task_storage[link.src_task_id].project_id,
+                        type=TaskEventType.LINK_CREATED,
+                        user=user,
+                        field=self._create_task_info(task_storage[link.dest_task_id]),
+                    )
+                    for link in links
+                ]
+            )
+            activity_notifier.notify_on_commit(task_events)
+            linked_task_ids = {task_id for link in links for task_id in (link.src_task_id, link.dest_task_id)}
+            task_manager = TaskManager()
+            task_manager.touch(linked_task_ids)
+            task_manager.sync_snapshots(linked_task_ids)
+
+            for link_key, link in link_storage.items():
+                for position, index in enumerate(index_storage[link_key]):
+                    result_storage[index] = BulkLinkResultInfo(index=index, id=link.pk, is_created=position == 0)
+
+        return [result_storage[index] for index in range(len(link_info_list))]
+
+    def bulk_delete(self, link_ids: list[int], user: User) -> list[BulkLinkResultInfo]:
+        with transaction.atomic():
+            link_storage = Link.objects.select_related("src_task", "dest_task").in_bulk(link_ids)
+            Link.objects.filter(pk__in=link_storage.keys()).delete()
+            task_events = TaskEvent.objects.bulk_create(
+                [
+                    TaskEvent(
+                        task_id=link.src_task_id,
+                        project_id=link.src_task.project_id,
+                        type=TaskEventType.LINK_DELETED,
+                        user=user,
+                        field=self._create_task_info(link.dest_task),
+                    )
+                    for link in link_storage.values()
+                ]
+            )
+            activity_notifier.notify_on_commit(task_events)
+            linked_task_ids = {
+                task_id for link in link_storage.values() for task_id in (link.src_task_id, link.dest_task_id)
+            }
+            task_manager = TaskManager()
+            task_manager.touch(linked_task_ids)
+            task_manager.sync_snapshots(linked_task_ids)
+
+        return [
+            BulkLinkResultInfo(index=index, id=link_id)
+            if link_id in link_storage
+            else BulkLinkResultInfo(index=index, id=link_id, error=f"Link with id {link_id} does not exist")
+            for index, link_id in enumerate(link_ids)
+        ]
+
+    def _lock_tasks(self, task_ids) -> dict[int, Task]:
+        # Links are only inserted while both tasks are locked, so a concurrent request cannot insert the same link
+        # between the existence check and the insert. Rows are locked in primary key order to avoid deadlocks.
+        return (
+            Task.objects.select_for_update().only("pk", "project_id", "key", "summary").order_by("pk").in_bulk(task_ids)
+        )
 
     def _create_task_info(self, task: Task) -> dict:
         return {"id": task.pk, "key": task.key, "summary": task.summary}
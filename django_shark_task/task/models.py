@@ -1,13 +1,15 @@
-import logging
-
-import jsonschema
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
 from django.db import models
-from jsonschema.exceptions import ValidationError
+from django.utils import timezone
 
 from django_shark_task.fields.models import Field, Screen
-from django_shark_task.task.const import TASK_EVENT_LISTENERS_JSON_SCHEMA
+from django_shark_task.task.const import (
+    FIELD_VALUE_INDEX_STR_MAX_LENGTH,
+    TASK_EVENT_LISTENERS_JSON_SCHEMA,
+)
+from django_shark_task.utils.json_schema import validate
+from django_shark_task.utils.plugins import validate_plugin_info_list
 from django_shark_task.workflow.models import Status, Workflow
 
 User = get_user_model()
@@ -58,17 +60,18 @@ class ProjectSchema(models.Model):
         if not self.is_active and Task.objects.filter(project_schema_id=self.pk).exists():
             raise ValueError("You cannot deactivate project schema with linked tasks")
         if self.event_listeners:
-            try:
-                jsonschema.validate(self.event_listeners, TASK_EVENT_LISTENERS_JSON_SCHEMA)
-            except ValidationError as e:
-                logger = logging.getLogger()
-                logger.error(e)
-                print(e)
-                raise ValueError("Invalid event listener schema")
+            validate(
+                self.event_listeners,
+                "task_event_listeners",
+                TASK_EVENT_LISTENERS_JSON_SCHEMA,
+                error_message="Invalid event listener schema",
+            )
+            validate_plugin_info_list(self.event_listeners, "Invalid event listener class")
         return super().save(*args, **kwargs)
 
 
 class Task(models.Model):
+    project = models.ForeignKey(Project, related_name="tasks", on_delete=models.PROTECT)
     project_schema = models.ForeignKey(ProjectSchema, related_name="tasks", on_delete=models.PROTECT)
     key = models.CharField(max_length=64, unique=True)
     task_num = models.IntegerField()
@@ -78,6 +81,18 @@ class Task(models.Model):
     created = models.DateTimeField(auto_now_add=True)
     updated = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["project", "created", "id"]),
+            models.Index(fields=["project_schema", "created", "id"]),
+        ]
+
+
+class TaskNumSequence(models.Model):
+    project = models.OneToOneField(Project, related_name="task_num_sequence", on_delete=models.PROTECT)
+    last_task_num = models.IntegerField(default=0)
+    updated = models.DateTimeField(auto_now=True)
+
 
 class TaskEventType:
     TASK_CREATED = "TASK_CREATED"
@@ -99,12 +114,49 @@ class TaskEventType:
 class TaskEvent(models.Model):
     type = models.CharField(max_length=128, choices=TaskEventType.CHOICES)
     task = models.ForeignKey(Task, related_name="task_events", on_delete=models.PROTECT)
+    project = models.ForeignKey(Project, related_name="task_events", on_delete=models.PROTECT)
     field = models.JSONField(null=True, blank=True)
     old_value = models.JSONField(null=True, blank=True)
     new_value = models.JSONField(null=True, blank=True)
     user = models.ForeignKey(User, related_name="shark_task_events", on_delete=models.PROTECT)
     created = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["project", "id"]),
+            models.Index(fields=["task", "created", "id"]),
+        ]
+
+
+class TaskEventDeliveryStatus:
+    PENDING = "PENDING"
+    PROCESSING = "PROCESSING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+    CHOICES = (
+        (PENDING, PENDING),
+        (PROCESSING, PROCESSING),
+        (DONE, DONE),
+        (FAILED, FAILED),
+    )
+
+
+class TaskEventDelivery(models.Model):
+    event_listener = models.JSONField()
+    task_event_ids = models.JSONField()
+    user = models.ForeignKey(User, related_name="shark_task_event_deliveries", on_delete=models.PROTECT)
+    status = models.CharField(
+        max_length=32, choices=TaskEventDeliveryStatus.CHOICES, default=TaskEventDeliveryStatus.PENDING
+    )
+    attempts = models.IntegerField(default=0)
+    next_attempt = models.DateTimeField(default=timezone.now)
+    error = models.TextField(null=True, blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "next_attempt"])]
+
 
 class LinkType(models.Model):
     src_name = models.CharField(max_length=128)
@@ -140,11 +192,39 @@ class FieldValue(models.Model):
         )
 
     def save(self, *args, **kwargs):
-        try:
-            jsonschema.validate(self.value, self.field.field_type.value_schema)
-        except ValidationError as e:
-            logger = logging.getLogger()
-            logger.error(e)
-            print(e)
-            raise ValueError("Invalid field value schema")
+        self.validate_value()
         return super().save(*args, **kwargs)
+
+    def validate_value(self) -> None:
+        self.field.field_type.validate_value(self.value)
+
+
+class TaskSearchDocument(models.Model):
+    task = models.OneToOneField(Task, related_name="search_document", on_delete=models.CASCADE)
+    project = models.ForeignKey(Project, related_name="task_search_documents", on_delete=models.PROTECT)
+    project_schema = models.ForeignKey(ProjectSchema, related_name="task_search_documents", on_delete=models.PROTECT)
+    content = models.TextField()
+    updated = models.DateTimeField(auto_now=True)
+
+
+class TaskSnapshot(models.Model):
+    task = models.OneToOneField(Task, related_name="snapshot", on_delete=models.CASCADE)
+    project_schema = models.ForeignKey(ProjectSchema, related_name="task_snapshots", on_delete=models.PROTECT)
+    data = models.JSONField()
+    updated = models.DateTimeField(auto_now=True)
+
+
+class FieldValueIndex(models.Model):
+    field_value = models.ForeignKey(FieldValue, related_name="index_entries", on_delete=models.CASCADE)
+    task = models.ForeignKey(Task, related_name="field_value_index_entries", on_delete=models.CASCADE)
+    field = models.ForeignKey(Field, related_name="field_value_index_entries", on_delete=models.CASCADE)
+    int_value = models.BigIntegerField(null=True)
+    str_value = models.CharField(max_length=FIELD_VALUE_INDEX_STR_MAX_LENGTH, null=True)
+    user_value = models.IntegerField(null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["field", "int_value", "task"]),
+            models.Index(fields=["field", "str_value", "task"]),
+            models.Index(fields=["field", "user_value", "task"]),
+        ]
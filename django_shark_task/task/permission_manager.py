@@ -1,56 +1,92 @@
+from typing import Iterable
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
 
-from django_shark_task.task.models import ProjectSchema
+from django_shark_task.task.const import USER_GROUP_IDS_CACHE_TIMEOUT
+from django_shark_task.task.models import Task
+from django_shark_task.task.project_schema_cache import ProjectSchemaSnapshot, project_schema_cache
 
 User = get_user_model()
 
 
 class PermissionManager:
-    def check_read_permissions(self, user: User, project_schema: ProjectSchema) -> None:
-        (
-            group_ids_with_read_permission,
-            group_ids_with_write_permission,
-            group_ids_with_delete_permission,
-        ) = self._get_group_ids_with_permission(project_schema)
-
-        if group_ids_with_read_permission and not self._is_user_in_groups(
-            user, group_ids_with_read_permission + group_ids_with_write_permission + group_ids_with_delete_permission
-        ):
-            raise PermissionError(f"No read permission {user.username} on project_schema {project_schema.pk}")
-
-    def check_write_permissions(self, user: User, project_schema: ProjectSchema) -> None:
-        _, group_ids_with_write_permission, group_ids_with_delete_permission = self._get_group_ids_with_permission(
-            project_schema
-        )
+    def check_read_permissions(self, user: User, project_schema: ProjectSchemaSnapshot) -> None:
+        if not self.has_read_permission(user, project_schema):
+            raise PermissionError(f"No read permission {user.username} on project_schema {project_schema.id}")
 
-        if group_ids_with_write_permission and not self._is_user_in_groups(
-            user, group_ids_with_write_permission + group_ids_with_delete_permission
-        ):
-            raise PermissionError(f"No write permission {user.username} on project_schema {project_schema.pk}")
+    def check_write_permissions(self, user: User, project_schema: ProjectSchemaSnapshot) -> None:
+        if not self.has_write_permission(user, project_schema):
+            raise PermissionError(f"No write permission {user.username} on project_schema {project_schema.id}")
 
-    def check_delete_permissions(self, user: User, project_schema: ProjectSchema) -> None:
-        _, _, group_ids_with_delete_permission = self._get_group_ids_with_permission(project_schema)
+    def check_delete_permissions(self, user: User, project_schema: ProjectSchemaSnapshot) -> None:
+        if not self.has_delete_permission(user, project_schema):
+            raise PermissionError(f"No delete permission {user.username} on project_schema {project_schema.id}")
 
-        if group_ids_with_delete_permission and not self._is_user_in_groups(user, group_ids_with_delete_permission):
-            raise PermissionError(f"No delete permission {user.username} on project_schema {project_schema.pk}")
+    def has_read_permission(self, user: User, project_schema: ProjectSchemaSnapshot) -> bool:
+        return not project_schema.group_ids_with_read_permission or self._is_user_in_groups(
+            user,
+            project_schema.group_ids_with_read_permission
+            | project_schema.group_ids_with_write_permission
+            | project_schema.group_ids_with_delete_permission,
+        )
 
-    def _get_group_ids_with_permission(self, project_schema: ProjectSchema) -> tuple[list[int], list[int], list[int]]:
-        group_ids_with_read_permission = (
-            list(project_schema.groups_with_read_permission.all().values_list("pk", flat=True))
-            if project_schema.groups_with_read_permission
-            else []
+    def has_write_permission(self, user: User, project_schema: ProjectSchemaSnapshot) -> bool:
+        return not project_schema.group_ids_with_write_permission or self._is_user_in_groups(
+            user, project_schema.group_ids_with_write_permission | project_schema.group_ids_with_delete_permission
         )
-        group_ids_with_write_permission = (
-            list(project_schema.groups_with_write_permission.all().values_list("pk", flat=True))
-            if project_schema.groups_with_write_permission
-            else []
+
+    def has_delete_permission(self, user: User, project_schema: ProjectSchemaSnapshot) -> bool:
+        return not project_schema.group_ids_with_delete_permission or self._is_user_in_groups(
+            user, project_schema.group_ids_with_delete_permission
         )
-        group_ids_with_delete_permission = (
-            list(project_schema.groups_with_delete_permission.all().values_list("pk", flat=True))
-            if project_schema.groups_with_delete_permission
-            else []
+
+    def filter_readable_project_schema_ids(self, user: User, project_schema_ids: Iterable[int]) -> set[int]:
+        return {
+            project_schema_id
+            for project_schema_id in set(project_schema_ids)
+            if self.has_read_permission(user, project_schema_cache.get(project_schema_id))
+        }
+
+    def filter_readable_tasks(self, user: User, tasks: Iterable[Task]) -> list[Task]:
+        tasks = list(tasks)
+        readable_project_schema_ids = self.filter_readable_project_schema_ids(
+            user, [task.project_schema_id for task in tasks]
         )
-        return group_ids_with_read_permission, group_ids_with_write_permission, group_ids_with_delete_permission
+        return [task for task in tasks if task.project_schema_id in readable_project_schema_ids]
+
+    def get_user_group_ids(self, user: User) -> frozenset[int]:
+        if (group_ids := getattr(user, "_shark_task_group_ids", None)) is not None:
+            return group_ids
+
+        shared_cache = self._get_shared_cache()
+        if shared_cache:
+            group_ids = shared_cache.get(get_user_group_ids_cache_key(user.pk))
+        if group_ids is None:
+            group_ids = frozenset(user.groups.values_list("pk", flat=True))
+            if shared_cache:
+                shared_cache.set(
+                    get_user_group_ids_cache_key(user.pk),
+                    group_ids,
+                    timeout=getattr(settings, "SHARK_TASK_USER_GROUP_CACHE_TIMEOUT", USER_GROUP_IDS_CACHE_TIMEOUT),
+                )
+        user._shark_task_group_ids = group_ids
+        return group_ids
+
+    def _is_user_in_groups(self, user: User, group_ids: frozenset[int]) -> bool:
+        return not self.get_user_group_ids(user).isdisjoint(group_ids)
+
+    def _get_shared_cache(self):
+        if cache_alias := getattr(settings, "SHARK_TASK_USER_GROUP_CACHE", None):
+            return caches[cache_alias]
+        return None
+
+
+def get_user_group_ids_cache_key(user_id: int) -> str:
+    return f"shark_task:user_group_ids:{user_id}"
+
 
-    def _is_user_in_groups(self, user: User, group_ids: list[str]) -> bool:
-        return user.groups.filter(pk__in=group_ids).exists()
+def invalidate_user_group_ids(user_ids: Iterable[int]) -> None:
+    if cache_alias := getattr(settings, "SHARK_TASK_USER_GROUP_CACHE", None):
+        caches[cache_alias].delete_many([get_user_group_ids_cache_key(user_id) for user_id in user_ids])
@@ -0,0 +1,121 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic.main import BaseModel
+
+from django_shark_task.fields.models import Field, ScreenField
+from django_shark_task.fields.serializers import ScreenFieldSerializer
+from django_shark_task.task.models import ProjectSchema
+from django_shark_task.utils.http import get_max_updated, make_weak_etag
+from django_shark_task.utils.versioned_cache import VersionedCache
+from django_shark_task.workflow.models import Status, Transition
+from django_shark_task.workflow.workflow_cache import workflow_cache
+
+
+class ProjectSchemaSnapshot(BaseModel):
+    id: int
+    version: int
+    project_id: int
+    project_key: str
+    task_type_id: int
+    screen_id: int
+    workflow_id: int
+    event_listeners: list[dict]
+    field_storage: dict[int, Field]
+    required_field_storage: dict[int, Field]
+    group_ids_with_read_permission: frozenset[int]
+    group_ids_with_write_permission: frozenset[int]
+    group_ids_with_delete_permission: frozenset[int]
+    initial_status: Status
+    serialized_screen_fields: list[dict]
+    screen_etag: str
+    screen_last_modified: Optional[datetime]
+
+    class Config:
+        arbitrary_types_allowed = True
+        allow_mutation = False
+
+
+class ProjectSchemaCache:
+    def __init__(self):
+        self._cache = VersionedCache("project_schema")
+
+    def get(self, project_schema_id: int) -> ProjectSchemaSnapshot:
+        return self._cache.get(
+            f"snapshot:{project_schema_id}",
+            lambda version: self._compile(
+                ProjectSchema.objects.select_related("project").get(pk=project_schema_id), version
+            ),
+        )
+
+    def get_active(self, project_id: int, task_type_id: int) -> ProjectSchemaSnapshot:
+        project_schema_id = self._cache.get(
+            f"active:{project_id}:{task_type_id}",
+            lambda _: ProjectSchema.objects.values_list("pk", flat=True).get(
+                project_id=project_id, task_type_id=task_type_id, is_active=True
+            ),
+        )
+        return self.get(project_schema_id)
+
+    def get_project_schema_ids(self, project_id: int) -> frozenset[int]:
+        return self._cache.get(
+            f"project:{project_id}",
+            lambda _: frozenset(ProjectSchema.objects.filter(project_id=project_id).values_list("pk", flat=True)),
+        )
+
+    def get_version(self) -> int:
+        return self._cache.get_version()
+
+    def invalidate(self) -> None:
+        self._cache.invalidate()
+
+    def invalidate_on_commit(self) -> None:
+        self._cache.invalidate_on_commit()
+
+    def _compile(self, project_schema: ProjectSchema, version: int) -> ProjectSchemaSnapshot:
+        screen_fields = (
+            ScreenField.objects.select_related("field__field_type")
+            .filter(screen_id=project_schema.screen_id)
+            .order_by("priority", "pk")
+        )
+        screen_last_modified = get_max_updated(
+            *(
+                updated
+                for screen_field in screen_fields
+                for updated in (screen_field.updated, screen_field.field.updated, screen_field.field.field_type.updated)
+            )
+        )
+        workflow = workflow_cache.get(project_schema.workflow_id)
+        if workflow.initial_transition_id is None:
+            raise Transition.DoesNotExist(f"Workflow {project_schema.workflow_id} has no initial transition")
+        initial_transition = workflow.transition_storage[workflow.initial_transition_id]
+        return ProjectSchemaSnapshot(
+            id=project_schema.pk,
+            version=version,
+            project_id=project_schema.project_id,
+            project_key=project_schema.project.key,
+            task_type_id=project_schema.task_type_id,
+            screen_id=project_schema.screen_id,
+            workflow_id=project_schema.workflow_id,
+            event_listeners=sorted(project_schema.event_listeners or [], key=lambda x: x["priority"]),
+            field_storage={screen_field.field_id: screen_field.field for screen_field in screen_fields},
+            required_field_storage={
+                screen_field.field_id: screen_field.field for screen_field in screen_fields if screen_field.is_required
+            },
+            group_ids_with_read_permission=frozenset(
+                project_schema.groups_with_read_permission.values_list("pk", flat=True)
+            ),
+            group_ids_with_write_permission=frozenset(
+                project_schema.groups_with_write_permission.values_list("pk", flat=True)
+            ),
+            group_ids_with_delete_permission=frozenset(
+                project_schema.groups_with_delete_permission.values_list("pk", flat=True)
+            ),
+            initial_status=initial_transition.dest_status,
+            serialized_screen_fields=ScreenFieldSerializer(screen_fields, many=True).data,
+            screen_etag=make_weak_etag("screen", project_schema.screen_id, len(screen_fields), screen_last_modified),
+            screen_last_modified=screen_last_modified,
+        )
+
+
+project_schema_cache = ProjectSchemaCache()
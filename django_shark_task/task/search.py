@@ -0,0 +1,111 @@
+import re
+from typing import Optional
+
+from django.db import connection
+
+from django_shark_task.task.const import SEARCH_FIELD_TYPE_KEYS
+from django_shark_task.task.models import FieldValue, Task, TaskSearchDocument
+
+SQLITE_SEARCH_TABLE = "django_shark_task_tasksearchdocument_fts"
+
+
+class TaskSearchIndexer:
+    def __init__(self):
+        self._has_sqlite_search_table: Optional[bool] = None
+
+    def reindex(self, tasks: list[Task]) -> None:
+        if not tasks:
+            return
+        task_ids = [task.pk for task in tasks]
+        content_storage: dict[int, list[str]] = {task.pk: [task.summary] for task in tasks}
+        for task_id, value in (
+            FieldValue.objects.filter(task_id__in=task_ids, field__field_type__key__in=SEARCH_FIELD_TYPE_KEYS)
+            .order_by("pk")
+            .values_list("task_id", "value")
+        ):
+            if isinstance(text := (value or {}).get("value"), str):
+                content_storage[task_id].append(text)
+
+        TaskSearchDocument.objects.filter(task_id__in=task_ids).delete()
+        TaskSearchDocument.objects.bulk_create(
+            [
+                TaskSearchDocument(
+                    task_id=task.pk,
+                    project_id=task.project_id,
+                    project_schema_id=task.project_schema_id,
+                    content="\n".join(content_storage[task.pk]),
+                )
+                for task in tasks
+            ]
+        )
+
+    def search(
+        self, project_id: int, project_schema_ids: Optional[set[int]], query: str, limit: int, offset: int
+    ) -> list[int]:
+        terms = re.findall(r"\w+", query)
+        if not terms:
+            return []
+        if connection.vendor == "sqlite" and self._get_has_sqlite_search_table():
+            return self._search_sqlite(project_id, project_schema_ids, terms, limit, offset)
+        if connection.vendor == "postgresql":
+            return self._search_postgresql(project_id, project_schema_ids, terms, limit, offset)
+        return self._search_fallback(project_id, project_schema_ids, terms, limit, offset)
+
+    def _search_sqlite(
+        self, project_id: int, project_schema_ids: Optional[set[int]], terms: list[str], limit: int, offset: int
+    ) -> list[int]:
+        sql = (
+            f"SELECT d.task_id FROM {SQLITE_SEARCH_TABLE} s "
+            f"JOIN {TaskSearchDocument._meta.db_table} d ON d.id = s.rowid "
+            f"WHERE {SQLITE_SEARCH_TABLE} MATCH %s AND d.project_id = %s"
+        )
+        params = [" ".join(f'"{term}"' for term in terms), project_id]
+        sql, params = self._add_project_schema_filter(sql, params, project_schema_ids)
+        sql += f" ORDER BY bm25({SQLITE_SEARCH_TABLE}), d.task_id DESC LIMIT %s OFFSET %s"
+        return self._fetch_task_ids(sql, params + [limit, offset])
+
+    def _search_postgresql(
+        self, project_id: int, project_schema_ids: Optional[set[int]], terms: list[str], limit: int, offset: int
+    ) -> list[int]:
+        sql = (
+            f"SELECT d.task_id FROM {TaskSearchDocument._meta.db_table} d "
+            "WHERE to_tsvector('simple', d.content) @@ plainto_tsquery('simple', %s) AND d.project_id = %s"
+        )
+        params = [" ".join(terms), project_id]
+        sql, params = self._add_project_schema_filter(sql, params, project_schema_ids)
+        sql += (
+            " ORDER BY ts_rank(to_tsvector('simple', d.content), plainto_tsquery('simple', %s)) DESC, "
+            "d.task_id DESC LIMIT %s OFFSET %s"
+        )
+        return self._fetch_task_ids(sql, params + [" ".join(terms), limit, offset])
+
+    def _search_fallback(
+        self, project_id: int, project_schema_ids: Optional[set[int]], terms: list[str], limit: int, offset: int
+    ) -> list[int]:
+        query_set = TaskSearchDocument.objects.filter(project_id=project_id)
+        if project_schema_ids is not None:
+            query_set = query_set.filter(project_schema_id__in=project_schema_ids)
+        for term in terms:
+            query_set = query_set.filter(content__icontains=term)
+        return list(query_set.order_by("-task_id").values_list("task_id", flat=True)[offset : offset + limit])
+
+    def _add_project_schema_filter(
+        self, sql: str, params: list, project_schema_ids: Optional[set[int]]
+    ) -> tuple[str, list]:
+        if project_schema_ids is None:
+            return sql, params
+        placeholders = ", ".join(["%s"] * len(project_schema_ids))
+        return f"{sql} AND d.project_schema_id IN ({placeholders})", params + sorted(project_schema_ids)
+
+    def _fetch_task_ids(self, sql: str, params: list) -> list[int]:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [row[0] for row in cursor.fetchall()]
+
+    def _get_has_sqlite_search_table(self) -> bool:
+        if self._has_sqlite_search_table is None:
+            self._has_sqlite_search_table = SQLITE_SEARCH_TABLE in connection.introspection.table_names()
+        return self._has_sqlite_search_table
+
+
+task_search_indexer = TaskSearchIndexer()
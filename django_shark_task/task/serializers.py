@@ -1,12 +1,35 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
-from django_shark_task.task.models import Link, LinkType, TaskEvent
+from django_shark_task.task.const import (
+    MAX_BATCH_TASK_COUNT,
+    MAX_BULK_LINK_COUNT,
+    MAX_BULK_TASK_COUNT,
+    MAX_LINK_GRAPH_DEPTH,
+    MAX_LINK_GRAPH_NODE_COUNT,
+    MAX_PROJECT_ACTIVITY_WAIT,
+    MAX_TASK_EVENT_PAGE_SIZE,
+    MAX_TASK_PAGE_SIZE,
+    MAX_TASK_SEARCH_PAGE_SIZE,
+    LinkDirection,
+)
+from django_shark_task.task.models import Link, LinkType, TaskEvent, TaskEventType
+from django_shark_task.utils.pagination import decode_cursor
 from django_shark_task.workflow.serializers import StatusSerializer
 
 User = get_user_model()
 
 
+class CursorField(serializers.CharField):
+    def to_internal_value(self, data):
+        cursor = super().to_internal_value(data)
+        try:
+            decode_cursor(cursor)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+        return cursor
+
+
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -41,6 +64,17 @@ class CreateTaskSerializer(serializers.Serializer):
     fields = FieldInfoSerializer(many=True)
 
 
+class BulkCreateTaskSerializer(serializers.Serializer):
+    tasks = CreateTaskSerializer(many=True, max_length=MAX_BULK_TASK_COUNT)
+
+
+class BulkTaskResultSerializer(serializers.Serializer):
+    index = serializers.IntegerField()
+    id = serializers.IntegerField(allow_null=True)
+    key = serializers.CharField(allow_null=True)
+    error = serializers.CharField(allow_null=True)
+
+
 class UpdateTaskSerializer(serializers.Serializer):
     summary = serializers.CharField(required=False)
     fields = FieldInfoSerializer(many=True)
@@ -62,8 +96,50 @@ class TaskSerializer(serializers.Serializer):
     updated = serializers.DateTimeField()
 
 
+class RequestTaskBatchSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), min_length=1, max_length=MAX_BATCH_TASK_COUNT)
+
+
+class BulkTransitTaskSerializer(serializers.Serializer):
+    task_ids = serializers.ListField(child=serializers.IntegerField(), min_length=1, max_length=MAX_BATCH_TASK_COUNT)
+    transition_id = serializers.IntegerField()
+
+
+class TransitResultSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    status = StatusSerializer(allow_null=True)
+    error = serializers.CharField(allow_null=True)
+
+
 class RequestTaskListSerializer(serializers.Serializer):
     project_id = serializers.IntegerField()
+    status_ids = serializers.ListField(child=serializers.IntegerField(), required=False)
+    task_type_ids = serializers.ListField(child=serializers.IntegerField(), required=False)
+    creator_ids = serializers.ListField(child=serializers.IntegerField(), required=False)
+    created_from = serializers.DateTimeField(required=False)
+    created_to = serializers.DateTimeField(required=False)
+    updated_from = serializers.DateTimeField(required=False)
+    updated_to = serializers.DateTimeField(required=False)
+    fields = serializers.JSONField(required=False)
+    cursor = CursorField(required=False)
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=MAX_TASK_PAGE_SIZE)
+
+    def validate_fields(self, value):
+        serializer = FieldInfoSerializer(data=value, many=True)
+        serializer.is_valid(raise_exception=True)
+        return serializer.data
+
+
+class RequestTaskSearchSerializer(serializers.Serializer):
+    project_id = serializers.IntegerField()
+    query = serializers.CharField()
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=MAX_TASK_SEARCH_PAGE_SIZE)
+    offset = serializers.IntegerField(required=False, min_value=0)
+
+
+class TaskSearchPageSerializer(serializers.Serializer):
+    tasks = ShortTaskSerializer(many=True)
+    next_offset = serializers.IntegerField(allow_null=True)
 
 
 class TaskEventSerializer(serializers.ModelSerializer):
@@ -74,15 +150,71 @@ class TaskEventSerializer(serializers.ModelSerializer):
         fields = (
             "id",
             "type",
-            "old_field",
+            "field",
             "old_value",
-            "new_field",
             "new_value",
             "user",
             "created",
         )
 
 
+class RequestTaskEventListSerializer(serializers.Serializer):
+    types = serializers.ListField(child=serializers.ChoiceField(choices=TaskEventType.CHOICES), required=False)
+    user_ids = serializers.ListField(child=serializers.IntegerField(), required=False)
+    created_from = serializers.DateTimeField(required=False)
+    created_to = serializers.DateTimeField(required=False)
+    cursor = CursorField(required=False)
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=MAX_TASK_EVENT_PAGE_SIZE)
+    stream = serializers.BooleanField(required=False, default=False)
+
+
+class TaskEventPageSerializer(serializers.Serializer):
+    events = TaskEventSerializer(many=True)
+    next_cursor = serializers.CharField(allow_null=True)
+
+
+class ProjectActivityEventSerializer(TaskEventSerializer):
+    class Meta(TaskEventSerializer.Meta):
+        fields = TaskEventSerializer.Meta.fields + ("task",)
+
+
+class RequestProjectActivitySerializer(serializers.Serializer):
+    after = serializers.IntegerField(required=False, min_value=0)
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=MAX_TASK_EVENT_PAGE_SIZE)
+    wait = serializers.FloatField(required=False, min_value=0, max_value=MAX_PROJECT_ACTIVITY_WAIT)
+
+
+class ProjectActivityPageSerializer(serializers.Serializer):
+    events = ProjectActivityEventSerializer(many=True)
+    next_cursor = serializers.IntegerField()
+
+
+class RequestLinkGraphSerializer(serializers.Serializer):
+    link_type_ids = serializers.ListField(child=serializers.IntegerField(), required=False)
+    direction = serializers.ChoiceField(choices=LinkDirection.CHOICES, required=False)
+    max_depth = serializers.IntegerField(required=False, min_value=0, max_value=MAX_LINK_GRAPH_DEPTH)
+    max_nodes = serializers.IntegerField(required=False, min_value=1, max_value=MAX_LINK_GRAPH_NODE_COUNT)
+
+
+class LinkGraphNodeSerializer(serializers.Serializer):
+    task = ShortTaskSerializer()
+    depth = serializers.IntegerField()
+
+
+class LinkGraphEdgeSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    link_type_id = serializers.IntegerField()
+    src_task_id = serializers.IntegerField()
+    dest_task_id = serializers.IntegerField()
+
+
+class LinkGraphSerializer(serializers.Serializer):
+    nodes = LinkGraphNodeSerializer(many=True)
+    edges = LinkGraphEdgeSerializer(many=True)
+    has_cycle = serializers.BooleanField()
+    is_truncated = serializers.BooleanField()
+
+
 class LinkTypeSerializer(serializers.ModelSerializer):
     class Meta:
         model = LinkType
@@ -100,6 +232,21 @@ class CreateLinkSerializer(serializers.Serializer):
     dest_task_id = serializers.IntegerField()
 
 
+class BulkCreateLinkSerializer(serializers.Serializer):
+    links = CreateLinkSerializer(many=True, min_length=1, max_length=MAX_BULK_LINK_COUNT)
+
+
+class BulkDeleteLinkSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), min_length=1, max_length=MAX_BULK_LINK_COUNT)
+
+
+class BulkLinkResultSerializer(serializers.Serializer):
+    index = serializers.IntegerField()
+    id = serializers.IntegerField(allow_null=True)
+    is_created = serializers.BooleanField()
+    error = serializers.CharField(allow_null=True)
+
+
 class LinkSerializer(serializers.ModelSerializer):
     link_type = LinkTypeSerializer
     src_task = ShortTaskSerializer
@@ -0,0 +1,55 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from django_shark_task.fields.models import Field, FieldType, Screen, ScreenField
+from django_shark_task.task.models import Project, ProjectSchema, TaskType
+from django_shark_task.task.permission_manager import invalidate_user_group_ids
+from django_shark_task.task.project_schema_cache import project_schema_cache
+from django_shark_task.workflow.models import Status, StatusType, Transition, Workflow
+
+
+def invalidate_project_schema_cache(sender, **kwargs):
+    project_schema_cache.invalidate_on_commit()
+
+
+def invalidate_project_schema_cache_on_m2m_change(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        project_schema_cache.invalidate_on_commit()
+
+
+def invalidate_user_group_ids_on_m2m_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        instance.__dict__.pop("_shark_task_group_ids", None)
+        if action in ("post_add", "post_remove", "post_clear"):
+            invalidate_user_group_ids([instance.pk])
+    elif action in ("post_add", "post_remove"):
+        invalidate_user_group_ids(pk_set)
+    elif action == "pre_clear":
+        invalidate_user_group_ids(instance.user_set.values_list("pk", flat=True))
+
+
+for sender in (
+    Project,
+    TaskType,
+    ProjectSchema,
+    Screen,
+    ScreenField,
+    Field,
+    FieldType,
+    Workflow,
+    Transition,
+    Status,
+    StatusType,
+):
+    post_save.connect(invalidate_project_schema_cache, sender=sender)
+    post_delete.connect(invalidate_project_schema_cache, sender=sender)
+
+for sender in (
+    Screen.fields.through,
+    ProjectSchema.groups_with_read_permission.through,
+    ProjectSchema.groups_with_write_permission.through,
+    ProjectSchema.groups_with_delete_permission.through,
+):
+    m2m_changed.connect(invalidate_project_schema_cache_on_m2m_change, sender=sender)
+
+m2m_changed.connect(invalidate_user_group_ids_on_m2m_change, sender=get_user_model().groups.through)
@@ -0,0 +1,322 @@
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+from rest_framework import serializers
+
+from django_shark_task.task.models import FieldValue, Link
+from django_shark_task.task.project_schema_cache import ProjectSchemaSnapshot, project_schema_cache
+from django_shark_task.workflow.workflow_cache import workflow_cache
+
+User = get_user_model()
+
+USER_COLUMNS = ("id", "username", "first_name", "last_name", "email")
+SHORT_TASK_COLUMNS = ("id", "project_schema_id", "summary", "creator_id", "created", "updated")
+TASK_COLUMNS = SHORT_TASK_COLUMNS + ("status_id", "key", "task_num")
+LINK_COLUMNS = ("id", "link_type_id", "src_task_id", "dest_task_id") + tuple(
+    f"{direction}_task__{column}" for direction in ("src", "dest") for column in SHORT_TASK_COLUMNS
+)
+
+date_time_field = serializers.DateTimeField()
+
+
+class UserRecord(NamedTuple):
+    id: int
+    username: str
+    first_name: str
+    last_name: str
+    email: str
+
+
+class FieldValueRecord(NamedTuple):
+    id: int
+    value: Optional[dict]
+
+
+class ShortTaskRecord(NamedTuple):
+    id: int
+    project_schema_id: int
+    project_id: int
+    task_type_id: int
+    summary: str
+    creator_id: int
+    created: datetime
+    updated: datetime
+
+
+class LinkRecord(NamedTuple):
+    id: int
+    link_type_id: int
+    linked_task: ShortTaskRecord
+
+
+class TaskRecord(NamedTuple):
+    id: int
+    project_schema_id: int
+    project_id: int
+    task_type_id: int
+    summary: str
+    creator_id: int
+    created: datetime
+    updated: datetime
+    status_id: int
+    key: str
+    task_num: int
+    fields: tuple[FieldValueRecord, ...]
+    inward_links: tuple[LinkRecord, ...]
+    outward_links: tuple[LinkRecord, ...]
+
+
+class ShortTaskRecordPage(NamedTuple):
+    tasks: list[ShortTaskRecord]
+    users: dict[int, UserRecord]
+    next_cursor: Optional[str]
+
+
+class TaskRecordTable(NamedTuple):
+    tasks: list[TaskRecord]
+    users: dict[int, UserRecord]
+    statuses: dict[int, dict]
+
+
+class TaskSearchRecordPage(NamedTuple):
+    tasks: list[ShortTaskRecord]
+    users: dict[int, UserRecord]
+    next_offset: Optional[int]
+
+
+class LinkGraphNodeRecord(NamedTuple):
+    task: ShortTaskRecord
+    depth: int
+
+
+class LinkGraphEdgeRecord(NamedTuple):
+    id: int
+    link_type_id: int
+    src_task_id: int
+    dest_task_id: int
+
+
+class LinkGraphRecord(NamedTuple):
+    nodes: list[LinkGraphNodeRecord]
+    edges: list[LinkGraphEdgeRecord]
+    users: dict[int, UserRecord]
+    has_cycle: bool
+    is_truncated: bool
+
+
+class TaskDataBuilder:
+    def get_short_task_record_page(self, task_rows: list[tuple], next_cursor: Optional[str]) -> ShortTaskRecordPage:
+        tasks = self._get_short_task_records(task_rows)
+        return ShortTaskRecordPage(
+            tasks=tasks, users=self._get_user_storage({task.creator_id for task in tasks}), next_cursor=next_cursor
+        )
+
+    def get_task_search_record_page(self, task_rows: list[tuple], next_offset: Optional[int]) -> TaskSearchRecordPage:
+        tasks = self._get_short_task_records(task_rows)
+        return TaskSearchRecordPage(
+            tasks=tasks, users=self._get_user_storage({task.creator_id for task in tasks}), next_offset=next_offset
+        )
+
+    def get_link_graph_record(
+        self,
+        node_rows: list[tuple[tuple, int]],
+        edges: list[LinkGraphEdgeRecord],
+        has_cycle: bool,
+        is_truncated: bool,
+    ) -> LinkGraphRecord:
+        tasks = self._get_short_task_records([task_row for task_row, _ in node_rows])
+        return LinkGraphRecord(
+            nodes=[LinkGraphNodeRecord(task, depth) for task, (_, depth) in zip(tasks, node_rows)],
+            edges=edges,
+            users=self._get_user_storage({task.creator_id for task in tasks}),
+            has_cycle=has_cycle,
+            is_truncated=is_truncated,
+        )
+
+    def get_task_record_table(self, task_rows: list[tuple]) -> TaskRecordTable:
+        if not task_rows:
+            return TaskRecordTable(tasks=[], users={}, statuses={})
+        task_ids = [task_row[0] for task_row in task_rows]
+
+        inward_link_storage: dict[int, list[LinkRecord]] = {task_id: [] for task_id in task_ids}
+        outward_link_storage: dict[int, list[LinkRecord]] = {task_id: [] for task_id in task_ids}
+        src_task_column_slice = slice(4, 4 + len(SHORT_TASK_COLUMNS))
+        dest_task_column_slice = slice(4 + len(SHORT_TASK_COLUMNS), None)
+        link_rows = list(
+            Link.objects.filter(Q(src_task_id__in=task_ids) | Q(dest_task_id__in=task_ids))
+            .order_by("pk")
+            .values_list(*LINK_COLUMNS)
+        )
+        project_schema_storage = self._get_project_schema_storage(
+            {task_row[1] for task_row in task_rows}
+            | {
+                link_row[column_slice][1]
+                for link_row in link_rows
+                for column_slice in (src_task_column_slice, dest_task_column_slice)
+            }
+        )
+        for link_row in link_rows:
+            link_id, link_type_id, src_task_id, dest_task_id = link_row[:4]
+            if dest_task_id in inward_link_storage:
+                inward_link_storage[dest_task_id].append(
+                    LinkRecord(
+                        link_id,
+                        link_type_id,
+                        self._get_short_task_record(link_row[src_task_column_slice], project_schema_storage),
+                    )
+                )
+            if src_task_id in outward_link_storage:
+                outward_link_storage[src_task_id].append(
+                    LinkRecord(
+                        link_id,
+                        link_type_id,
+                        self._get_short_task_record(link_row[dest_task_column_slice], project_schema_storage),
+                    )
+                )
+
+        field_value_storage: dict[int, dict[int, dict]] = {task_id: {} for task_id in task_ids}
+        for task_id, field_id, value in FieldValue.objects.filter(
+            task_id__in=task_ids, value__isnull=False
+        ).values_list("task_id", "field_id", "value"):
+            field_value_storage[task_id][field_id] = value
+
+        tasks: list[TaskRecord] = []
+        statuses: dict[int, dict] = {}
+        for task_id, project_schema_id, summary, creator_id, created, updated, status_id, key, task_num in task_rows:
+            project_schema = project_schema_storage[project_schema_id]
+            if status_id not in statuses:
+                statuses[status_id] = workflow_cache.get(project_schema.workflow_id).get_serialized_status(status_id)
+            tasks.append(
+                TaskRecord(
+                    task_id,
+                    project_schema_id,
+                    project_schema.project_id,
+                    project_schema.task_type_id,
+                    summary,
+                    creator_id,
+                    created,
+                    updated,
+                    status_id,
+                    key,
+                    task_num,
+                    tuple(
+                        FieldValueRecord(field_id, field_value_storage[task_id].get(field_id))
+                        for field_id in project_schema.field_storage
+                    ),
+                    tuple(inward_link_storage[task_id]),
+                    tuple(outward_link_storage[task_id]),
+                )
+            )
+        user_ids = {task.creator_id for task in tasks} | {
+            link.linked_task.creator_id for task in tasks for link in task.inward_links + task.outward_links
+        }
+        return TaskRecordTable(tasks=tasks, users=self._get_user_storage(user_ids), statuses=statuses)
+
+    def get_short_task_page_data(self, short_task_record_page: ShortTaskRecordPage) -> dict:
+        user_data_storage = self._get_user_data_storage(short_task_record_page.users)
+        return {
+            "tasks": [self._get_short_task_data(task, user_data_storage) for task in short_task_record_page.tasks],
+            "next_cursor": short_task_record_page.next_cursor,
+        }
+
+    def get_task_search_page_data(self, task_search_record_page: TaskSearchRecordPage) -> dict:
+        user_data_storage = self._get_user_data_storage(task_search_record_page.users)
+        return {
+            "tasks": [self._get_short_task_data(task, user_data_storage) for task in task_search_record_page.tasks],
+            "next_offset": task_search_record_page.next_offset,
+        }
+
+    def get_link_graph_data(self, link_graph_record: LinkGraphRecord) -> dict:
+        user_data_storage = self._get_user_data_storage(link_graph_record.users)
+        return {
+            "nodes": [
+                {"task": self._get_short_task_data(node.task, user_data_storage), "depth": node.depth}
+                for node in link_graph_record.nodes
+            ],
+            "edges": [edge._asdict() for edge in link_graph_record.edges],
+            "has_cycle": link_graph_record.has_cycle,
+            "is_truncated": link_graph_record.is_truncated,
+        }
+
+    def get_task_data_storage(self, task_record_table: TaskRecordTable) -> dict[int, dict]:
+        user_data_storage = self._get_user_data_storage(task_record_table.users)
+        return {
+            task.id: {
+                "id": task.id,
+                "project_id": task.project_id,
+                "task_type_id": task.task_type_id,
+                "summary": task.summary,
+                "status": task_record_table.statuses[task.status_id],
+                "key": task.key,
+                "task_num": task.task_num,
+                "creator": user_data_storage[task.creator_id],
+                "fields": [{"id": field.id, "value": self._get_field_value_data(field.value)} for field in task.fields],
+                "inward_links": [self._get_link_data(link, user_data_storage) for link in task.inward_links],
+                "outward_links": [self._get_link_data(link, user_data_storage) for link in task.outward_links],
+                "created": date_time_field.to_representation(task.created),
+                "updated": date_time_field.to_representation(task.updated),
+            }
+            for task in task_record_table.tasks
+        }
+
+    def _get_short_task_records(self, task_rows: list[tuple]) -> list[ShortTaskRecord]:
+        project_schema_storage = self._get_project_schema_storage({task_row[1] for task_row in task_rows})
+        return [self._get_short_task_record(task_row, project_schema_storage) for task_row in task_rows]
+
+    def _get_short_task_record(
+        self, task_row: tuple, project_schema_storage: dict[int, ProjectSchemaSnapshot]
+    ) -> ShortTaskRecord:
+        task_id, project_schema_id, summary, creator_id, created, updated = task_row[: len(SHORT_TASK_COLUMNS)]
+        project_schema = project_schema_storage[project_schema_id]
+        return ShortTaskRecord(
+            task_id,
+            project_schema_id,
+            project_schema.project_id,
+            project_schema.task_type_id,
+            summary,
+            creator_id,
+            created,
+            updated,
+        )
+
+    def _get_project_schema_storage(self, project_schema_ids: set[int]) -> dict[int, ProjectSchemaSnapshot]:
+        return {
+            project_schema_id: project_schema_cache.get(project_schema_id) for project_schema_id in project_schema_ids
+        }
+
+    def _get_user_storage(self, user_ids: set[int]) -> dict[int, UserRecord]:
+        return {
+            user_row[0]: UserRecord._make(user_row)
+            for user_row in User.objects.filter(pk__in=user_ids).values_list(*USER_COLUMNS)
+        }
+
+    def _get_user_data_storage(self, user_storage: dict[int, UserRecord]) -> dict[int, dict]:
+        return {user_id: user._asdict() for user_id, user in user_storage.items()}
+
+    def _get_link_data(self, link: LinkRecord, user_data_storage: dict[int, dict]) -> dict:
+        return {
+            "id": link.id,
+            "link_type_id": link.link_type_id,
+            "linked_task": self._get_short_task_data(link.linked_task, user_data_storage),
+        }
+
+    def _get_short_task_data(self, task: ShortTaskRecord, user_data_storage: dict[int, dict]) -> dict:
+        return {
+            "id": task.id,
+            "project_id": task.project_id,
+            "task_type_id": task.task_type_id,
+            "summary": task.summary,
+            "creator": user_data_storage[task.creator_id],
+            "created": date_time_field.to_representation(task.created),
+            "updated": date_time_field.to_representation(task.updated),
+        }
+
+    def _get_field_value_data(self, value):
+        if value is None:
+            return None
+        return {str(key): item for key, item in value.items()}
+
+
+task_data_builder = TaskDataBuilder()
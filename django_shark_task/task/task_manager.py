@@ -1,31 +1,81 @@
+import asyncio
 import logging
-from datetime import datetime
-from typing import Optional
+import operator
+import time
+from datetime import datetime, timedelta
+from functools import reduce
+from typing import Iterator, Optional
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db import transaction
-from django.db.models import Q
+from django.db import connections, router, transaction
+from django.db.models import Case, Exists, Max, OuterRef, Q, Value, When
+from django.utils import timezone
 from pydantic.main import BaseModel
 
-from django_shark_task.fields.models import Field, Screen
-from django_shark_task.fields.serializers import ShortFieldSerializer
+from django_shark_task.fields.models import Field
+from django_shark_task.task.activity_notifier import activity_notifier
+from django_shark_task.task.const import (
+    DEFAULT_LINK_GRAPH_DEPTH,
+    DEFAULT_LINK_GRAPH_NODE_COUNT,
+    DEFAULT_TASK_EVENT_PAGE_SIZE,
+    DEFAULT_TASK_PAGE_SIZE,
+    DEFAULT_TASK_SEARCH_PAGE_SIZE,
+    MAX_LINK_GRAPH_DEPTH,
+    MAX_LINK_GRAPH_NODE_COUNT,
+    MAX_PROJECT_ACTIVITY_WAIT,
+    MAX_TASK_EVENT_PAGE_SIZE,
+    MAX_TASK_PAGE_SIZE,
+    MAX_TASK_SEARCH_PAGE_SIZE,
+    PROJECT_ACTIVITY_SETTLE_TIME,
+    SEARCH_FIELD_TYPE_KEYS,
+    TASK_EVENT_STREAM_CHUNK_SIZE,
+    LinkDirection,
+)
+from django_shark_task.task.event_dispatcher import task_event_dispatcher
+from django_shark_task.task.field_value_index import field_value_indexer
 from django_shark_task.task.models import (
     FieldValue,
     Link,
-    Project,
     ProjectSchema,
     Task,
     TaskEvent,
     TaskEventType,
+    TaskNumSequence,
+    TaskSnapshot,
 )
 from django_shark_task.task.permission_manager import PermissionManager
-from django_shark_task.utils.utils import Condition, EventListener, Postfunction, create_instance
+from django_shark_task.task.project_schema_cache import ProjectSchemaSnapshot, project_schema_cache
+from django_shark_task.task.search import task_search_indexer
+from django_shark_task.task.task_data import (
+    SHORT_TASK_COLUMNS,
+    TASK_COLUMNS,
+    USER_COLUMNS,
+    LinkGraphEdgeRecord,
+    LinkGraphRecord,
+    LinkRecord,
+    ShortTaskRecord,
+    ShortTaskRecordPage,
+    TaskRecordTable,
+    TaskSearchRecordPage,
+    UserRecord,
+    task_data_builder,
+)
+from django_shark_task.utils.http import get_max_updated, make_weak_etag
+from django_shark_task.utils.pagination import decode_cursor, encode_cursor
+from django_shark_task.utils.plugins import get_plugin_info_list
+from django_shark_task.utils.utils import execute_postfunction, get_active_task_ids
 from django_shark_task.workflow.models import Status, Transition
-from django_shark_task.workflow.serializers import StatusSerializer
+from django_shark_task.workflow.workflow_cache import workflow_cache
 
 User = get_user_model()
 
 
+def is_task_snapshot_enabled() -> bool:
+    return getattr(settings, "SHARK_TASK_SNAPSHOTS", False)
+
+
 class FieldValueInfo(BaseModel):
     id: int
     value: Optional[dict]
@@ -62,6 +112,77 @@ class ShortTaskInfo(BaseModel):
         arbitrary_types_allowed = True
 
 
+class BulkTaskResultInfo(BaseModel):
+    index: int
+    id: Optional[int]
+    key: Optional[str]
+    error: Optional[str]
+
+
+class TaskFilterInfo(BaseModel):
+    project_id: int
+    status_ids: Optional[list[int]]
+    task_type_ids: Optional[list[int]]
+    creator_ids: Optional[list[int]]
+    created_from: Optional[datetime]
+    created_to: Optional[datetime]
+    updated_from: Optional[datetime]
+    updated_to: Optional[datetime]
+    fields: list[FieldValueInfo] = []
+    cursor: Optional[str]
+    limit: int = DEFAULT_TASK_PAGE_SIZE
+
+
+class ShortTaskPageInfo(BaseModel):
+    tasks: list[ShortTaskInfo]
+    next_cursor: Optional[str]
+
+
+class TaskSearchInfo(BaseModel):
+    project_id: int
+    query: str
+    limit: int = DEFAULT_TASK_SEARCH_PAGE_SIZE
+    offset: int = 0
+
+
+class TaskSearchPageInfo(BaseModel):
+    tasks: list[ShortTaskInfo]
+    next_offset: Optional[int]
+
+
+class TaskEventFilterInfo(BaseModel):
+    task_id: int
+    types: Optional[list[str]]
+    user_ids: Optional[list[int]]
+    created_from: Optional[datetime]
+    created_to: Optional[datetime]
+    cursor: Optional[str]
+    limit: int = DEFAULT_TASK_EVENT_PAGE_SIZE
+
+
+class TaskEventPageInfo(BaseModel):
+    events: list[TaskEvent]
+    next_cursor: Optional[str]
+
+    class Config:
+        arbitrary_types_allowed = True
+
+
+class ProjectActivityFilterInfo(BaseModel):
+    project_id: int
+    after: int = 0
+    limit: int = DEFAULT_TASK_EVENT_PAGE_SIZE
+    wait: float = 0
+
+
+class ProjectActivityPageInfo(BaseModel):
+    events: list[TaskEvent]
+    next_cursor: int
+
+    class Config:
+        arbitrary_types_allowed = True
+
+
 class LinkInfo(BaseModel):
     id: int
     link_type_id: int
@@ -71,6 +192,33 @@ class LinkInfo(BaseModel):
         arbitrary_types_allowed = True
 
 
+class LinkGraphFilterInfo(BaseModel):
+    task_id: int
+    link_type_ids: Optional[list[int]]
+    direction: str = LinkDirection.OUTWARD
+    max_depth: int = DEFAULT_LINK_GRAPH_DEPTH
+    max_nodes: int = DEFAULT_LINK_GRAPH_NODE_COUNT
+
+
+class LinkGraphNodeInfo(BaseModel):
+    task: ShortTaskInfo
+    depth: int
+
+
+class LinkGraphEdgeInfo(BaseModel):
+    id: int
+    link_type_id: int
+    src_task_id: int
+    dest_task_id: int
+
+
+class LinkGraphInfo(BaseModel):
+    nodes: list[LinkGraphNodeInfo]
+    edges: list[LinkGraphEdgeInfo]
+    has_cycle: bool
+    is_truncated: bool
+
+
 class TaskInfo(BaseModel):
     id: int
     project_id: int
@@ -90,72 +238,169 @@ class TaskInfo(BaseModel):
         arbitrary_types_allowed = True
 
 
+class TaskCacheInfo(BaseModel):
+    etag: str
+    last_modified: datetime
+
+
+class TaskResultInfo(BaseModel):
+    id: int
+    task: Optional[TaskInfo]
+    error: Optional[str]
+
+    class Config:
+        arbitrary_types_allowed = True
+
+
+class TransitResultInfo(BaseModel):
+    id: int
+    status: Optional[Status]
+    error: Optional[str]
+
+    class Config:
+        arbitrary_types_allowed = True
+
+
 class TaskManager:
     def __init__(self):
         self._permission_manager = PermissionManager()
 
     def create(self, task_info: CreateTaskInfo, user: User) -> TaskInfo:
-        with transaction.atomic():
-            project_schema = (
-                ProjectSchema.objects.select_related("project", "screen")
-                .prefetch_related(
-                    "groups_with_read_permission",
-                    "groups_with_write_permission",
-                    "groups_with_delete_permission",
-                    "screen__fields__screen_field_schemas",
-                )
-                .get(project_id=task_info.project_id, task_type_id=task_info.task_type_id, is_active=True)
-            )
-            self._permission_manager.check_write_permissions(user, project_schema)
-
-            project = project_schema.project
-            self._validate_field_info_list_during_creation(project_schema.screen, task_info.fields)
+        project_schema = project_schema_cache.get_active(task_info.project_id, task_info.task_type_id)
+        self._permission_manager.check_write_permissions(user, project_schema)
+        self._validate_field_info_list_during_creation(project_schema, task_info.fields)
 
-            initial_status = self._get_initial_status(project_schema)
-
-            task_num = self.get_max_task_num(task_info.project_id) + 1
+        task_num = self.reserve_task_nums(task_info.project_id)
+        with transaction.atomic():
             task = Task.objects.create(
-                project_schema=project_schema,
-                key=self.generate_task_key(project, task_num),
+                project_id=project_schema.project_id,
+                project_schema_id=project_schema.id,
+                key=self.generate_task_key(project_schema.project_key, task_num),
                 task_num=task_num,
                 summary=task_info.summary,
-                status=initial_status,
+                status=project_schema.initial_status,
                 creator=user,
             )
-            task_event = TaskEvent.objects.create(task=task, type=TaskEventType.TASK_CREATED, user=user)
+            task_event = TaskEvent.objects.create(
+                task=task, project_id=project_schema.project_id, type=TaskEventType.TASK_CREATED, user=user
+            )
 
+            field_values: list[FieldValue] = []
             for field_info in task_info.fields:
-                field = Field.objects.select_related("field_type").get(pk=field_info.id)
-                FieldValue.objects.create(task=task, field=field, value=field_info.value)
+                field = self._get_field(project_schema, field_info.id)
+                field_values.append(FieldValue.objects.create(task=task, field=field, value=field_info.value))
+            field_value_indexer.reindex(field_values)
+            task_search_indexer.reindex([task])
 
-            self._notify_task_subscribers(task, [task_event], user, project_schema.event_listeners)
+            self._notify_task_subscribers([task_event], user, project_schema.event_listeners)
 
-            return self._get(task)
+            self.sync_snapshots([task.pk])
+            return self._get(task.pk)
 
-    def update(self, task_id: int, task_info: UpdateTaskInfo, user: User):
-        with transaction.atomic():
-            task = (
-                Task.objects.select_related("status")
-                .select_related("project_schema__project")
-                .prefetch_related(
-                    "project_schema__screen__fields",
-                    "project_schema__groups_with_read_permission",
-                    "project_schema__groups_with_write_permission",
-                    "project_schema__groups_with_delete_permission",
-                )
-                .get(pk=task_id)
+    def bulk_create(self, task_info_list: list[CreateTaskInfo], user: User) -> list[BulkTaskResultInfo]:
+        result_storage: dict[int, BulkTaskResultInfo] = {}
+        checked_project_schema_ids: set[int] = set()
+        field_storage = self._get_off_screen_field_storage(task_info_list)
+
+        valid_task_info_storage: dict[
+            int, list[tuple[int, CreateTaskInfo, ProjectSchemaSnapshot, list[FieldValue]]]
+        ] = {}
+        for index, task_info in enumerate(task_info_list):
+            try:
+                project_schema = project_schema_cache.get_active(task_info.project_id, task_info.task_type_id)
+                if project_schema.id not in checked_project_schema_ids:
+                    self._permission_manager.check_write_permissions(user, project_schema)
+                    checked_project_schema_ids.add(project_schema.id)
+                self._validate_field_info_list_during_creation(project_schema, task_info.fields)
+
+                field_values: list[FieldValue] = []
+                for field_info in task_info.fields:
+                    if any(field_value.field.pk == field_info.id for field_value in field_values):
+                        raise ValueError(f"Field {field_info.id} is duplicated")
+                    field = project_schema.field_storage.get(field_info.id) or field_storage.get(field_info.id)
+                    if field is None:
+                        raise ValueError(f"Field {field_info.id} does not exist")
+                    field_value = FieldValue(field=field, value=field_info.value)
+                    field_value.validate_value()
+                    field_values.append(field_value)
+            except (ProjectSchema.DoesNotExist, PermissionError, ValueError) as e:
+                result_storage[index] = BulkTaskResultInfo(index=index, error=str(e))
+                continue
+            valid_task_info_storage.setdefault(project_schema.project_id, []).append(
+                (index, task_info, project_schema, field_values)
             )
-            project_schema = task.project_schema
+
+        first_task_num_storage = {
+            project_id: self.reserve_task_nums(project_id, len(valid_task_info_list))
+            for project_id, valid_task_info_list in sorted(valid_task_info_storage.items())
+        }
+        with transaction.atomic():
+            for project_id, valid_task_info_list in valid_task_info_storage.items():
+                first_task_num = first_task_num_storage[project_id]
+                tasks = []
+                for task_num, (_, task_info, project_schema, _) in enumerate(valid_task_info_list, first_task_num):
+                    tasks.append(
+                        Task(
+                            project_id=project_id,
+                            project_schema_id=project_schema.id,
+                            key=self.generate_task_key(project_schema.project_key, task_num),
+                            task_num=task_num,
+                            summary=task_info.summary,
+                            status=project_schema.initial_status,
+                            creator=user,
+                        )
+                    )
+                tasks = Task.objects.bulk_create(tasks)
+                if any(task.pk is None for task in tasks):
+                    task_id_storage = dict(
+                        Task.objects.filter(key__in=[task.key for task in tasks]).values_list("key", "pk")
+                    )
+                    for task in tasks:
+                        task.pk = task_id_storage[task.key]
+
+                field_values: list[FieldValue] = []
+                task_events: list[TaskEvent] = []
+                for task, (_, _, _, task_field_values) in zip(tasks, valid_task_info_list):
+                    for field_value in task_field_values:
+                        field_value.task = task
+                        field_values.append(field_value)
+                    task_events.append(
+                        TaskEvent(task=task, project_id=project_id, type=TaskEventType.TASK_CREATED, user=user)
+                    )
+                FieldValue.objects.bulk_create(field_values)
+                field_value_indexer.reindex(field_values)
+                task_search_indexer.reindex(tasks)
+                self._bulk_create_task_events(task_events)
+
+                project_schema_task_event_storage: dict[int, list[TaskEvent]] = {}
+                for task, task_event, (index, _, project_schema, _) in zip(tasks, task_events, valid_task_info_list):
+                    project_schema_task_event_storage.setdefault(project_schema.id, []).append(task_event)
+                    result_storage[index] = BulkTaskResultInfo(index=index, id=task.pk, key=task.key)
+                for project_schema_id, project_schema_task_events in project_schema_task_event_storage.items():
+                    self._notify_task_subscribers(
+                        project_schema_task_events,
+                        user,
+                        project_schema_cache.get(project_schema_id).event_listeners,
+                    )
+                self.sync_snapshots([task.pk for task in tasks])
+
+        return [result_storage[index] for index in range(len(task_info_list))]
+
+    def update(self, task_id: int, task_info: UpdateTaskInfo, user: User) -> TaskInfo:
+        with transaction.atomic():
+            task = Task.objects.select_related("status__status_type", "creator").get(pk=task_id)
+            project_schema = project_schema_cache.get(task.project_schema_id)
             self._permission_manager.check_write_permissions(user, project_schema)
-            self._validate_field_info_list_during_update(project_schema.screen, task_info.fields)
+            self._validate_field_info_list_during_update(project_schema, task_info.fields)
 
             task_events: list[TaskEvent] = []
-            if task_info.summary:
+            if task_info.summary and task_info.summary != task.summary:
                 old_summary = task.summary
                 task.summary = task_info.summary
                 task_events.append(
                     TaskEvent(
                         task=task,
+                        project_id=project_schema.project_id,
                         type=TaskEventType.SUMMARY_UPDATED,
                         old_value={"summary": old_summary},
                         new_value={"summary": task_info.summary},
@@ -163,229 +408,870 @@ class TaskManager:
                     )
                 )
 
+            field_ids = [field_info.id for field_info in task_info.fields]
+            if len(set(field_ids)) != len(field_ids):
+                raise ValueError("Field values contain duplicated fields")
+            field_storage = self._get_field_storage(project_schema, field_ids)
+            field_value_storage = {
+                field_value.field_id: field_value
+                for field_value in FieldValue.objects.filter(task=task, field_id__in=field_ids)
+            }
+
+            created_field_values: list[FieldValue] = []
+            updated_field_values: list[FieldValue] = []
+            deleted_field_value_ids: list[int] = []
+            now = timezone.now()
             for field_info in task_info.fields:
-                field_value, _ = FieldValue.objects.get_or_create(task=task, field_id=field_info.id)
-                field = Field.objects.get(pk=field_info.id)
-                old_value = field_value.value
-                field_value.value = field_info.value
-                field_value.save()
+                field = field_storage[field_info.id]
+                field_value = field_value_storage.get(field_info.id)
+                old_value = field_value.value if field_value else None
+                if old_value == field_info.value:
+                    continue
+
+                if field_info.value is None:
+                    deleted_field_value_ids.append(field_value.pk)
+                elif field_value is None:
+                    field_value = FieldValue(task=task, field=field, value=field_info.value)
+                    field_value.validate_value()
+                    created_field_values.append(field_value)
+                else:
+                    field_value.field = field
+                    field_value.value = field_info.value
+                    field_value.updated = now
+                    field_value.validate_value()
+                    updated_field_values.append(field_value)
 
                 task_events.append(
                     TaskEvent(
                         task=task,
+                        project_id=project_schema.project_id,
                         type=TaskEventType.TASK_UPDATED,
-                        field=ShortFieldSerializer(field).data,
+                        field={"id": field.pk, "key": field.key, "name": field.name},
                         old_value=old_value,
                         new_value=field_info.value,
                         user=user,
                     )
                 )
 
-            TaskEvent.objects.bulk_create(task_events)
+            if not task_events:
+                return self._get(task.pk)
+
+            if created_field_values:
+                FieldValue.objects.bulk_create(created_field_values)
+            if updated_field_values:
+                FieldValue.objects.bulk_update(updated_field_values, ["value", "updated"])
+            if deleted_field_value_ids:
+                FieldValue.objects.filter(pk__in=deleted_field_value_ids).delete()
+            field_value_indexer.reindex(created_field_values + updated_field_values)
+            if any(
+                task_event.type == TaskEventType.SUMMARY_UPDATED
+                or field_storage[task_event.field["id"]].field_type.key in SEARCH_FIELD_TYPE_KEYS
+                for task_event in task_events
+            ):
+                task_search_indexer.reindex([task])
+            self._bulk_create_task_events(task_events)
 
-            task.updated = datetime.now()
             task.save()
 
-            self._notify_task_subscribers(task, task_events, user, project_schema.event_listeners)
+            self._notify_task_subscribers(task_events, user, project_schema.event_listeners)
 
-        return self._get(task)
+            self.sync_snapshots([task.pk])
+            return self._get(task.pk)
 
     def delete(self, task_id: int, user: User) -> None:
         with transaction.atomic():
-            task = Task.objects.prefetch_related(
-                "project_schema__groups_with_read_permission",
-                "project_schema__groups_with_write_permission",
-                "project_schema__groups_with_delete_permission",
-            ).get(pk=task_id)
-            self._permission_manager.check_delete_permissions(user, task.project_schema)
+            task = Task.objects.get(pk=task_id)
+            self._permission_manager.check_delete_permissions(user, project_schema_cache.get(task.project_schema_id))
             TaskEvent.objects.filter(task_id=task_id).delete()
             FieldValue.objects.filter(task_id=task_id).delete()
             task.delete()
 
+    def get_cache_info(self, task_id: int, user: User) -> TaskCacheInfo:
+        project_schema_id, updated = Task.objects.values_list("project_schema_id", "updated").get(pk=task_id)
+        project_schema = project_schema_cache.get(project_schema_id)
+        self._permission_manager.check_read_permissions(user, project_schema)
+        workflow = workflow_cache.get(project_schema.workflow_id)
+        # Linked tasks are embedded in the response, so a write to any of them must change the ETag as well.
+        linked_updated = Link.objects.filter(Q(src_task_id=task_id) | Q(dest_task_id=task_id)).aggregate(
+            src_task_updated=Max("src_task__updated"), dest_task_updated=Max("dest_task__updated")
+        )
+        updated = get_max_updated(updated, *linked_updated.values())
+        return TaskCacheInfo(
+            etag=make_weak_etag("task", task_id, updated, workflow.etag, project_schema.screen_etag),
+            last_modified=get_max_updated(updated, workflow.last_modified, project_schema.screen_last_modified),
+        )
+
+    def touch(self, task_ids) -> None:
+        if task_ids:
+            Task.objects.filter(pk__in=task_ids).update(updated=timezone.now())
+
+    def get_data(self, task_id: int, user: User) -> dict:
+        if is_task_snapshot_enabled() and (snapshot := TaskSnapshot.objects.filter(task_id=task_id).first()):
+            self._permission_manager.check_read_permissions(user, project_schema_cache.get(snapshot.project_schema_id))
+            return snapshot.data
+
+        task_record_table = task_data_builder.get_task_record_table(
+            [Task.objects.values_list(*TASK_COLUMNS).get(pk=task_id)]
+        )
+        task = task_record_table.tasks[0]
+        self._permission_manager.check_read_permissions(user, project_schema_cache.get(task.project_schema_id))
+        task_data = task_data_builder.get_task_data_storage(task_record_table)[task_id]
+        if is_task_snapshot_enabled():
+            self._insert_snapshots(
+                [TaskSnapshot(task_id=task_id, project_schema_id=task.project_schema_id, data=task_data)]
+            )
+        return task_data
+
     def get(self, task_id: int, user: User) -> TaskInfo:
-        task = (
-            Task.objects.select_related("status")
-            .select_related("project_schema__project")
-            .prefetch_related(
-                "project_schema__screen__fields",
-                "project_schema__groups_with_read_permission",
-                "project_schema__groups_with_write_permission",
-                "project_schema__groups_with_delete_permission",
+        task_row = Task.objects.values_list(*TASK_COLUMNS).get(pk=task_id)
+        self._permission_manager.check_read_permissions(user, project_schema_cache.get(task_row[1]))
+        return self._get_task_info_list(task_data_builder.get_task_record_table([task_row]))[0]
+
+    def get_many_data(self, task_ids: list[int], user: User) -> list[dict]:
+        snapshots = list(TaskSnapshot.objects.filter(task_id__in=task_ids)) if is_task_snapshot_enabled() else []
+        project_schema_id_storage = {snapshot.task_id: snapshot.project_schema_id for snapshot in snapshots}
+        task_rows = (
+            list(
+                Task.objects.filter(pk__in=set(task_ids) - project_schema_id_storage.keys()).values_list(*TASK_COLUMNS)
             )
-            .get(pk=task_id)
+            if len(project_schema_id_storage) < len(set(task_ids))
+            else []
         )
-        self._permission_manager.check_delete_permissions(user, task.project_schema)
-        return self._get(task)
+        project_schema_id_storage.update({task_row[0]: task_row[1] for task_row in task_rows})
+        readable_project_schema_ids = self._permission_manager.filter_readable_project_schema_ids(
+            user, set(project_schema_id_storage.values())
+        )
+
+        task_data_storage = {snapshot.task_id: snapshot.data for snapshot in snapshots}
+        built_task_data_storage = task_data_builder.get_task_data_storage(
+            task_data_builder.get_task_record_table(
+                [task_row for task_row in task_rows if task_row[1] in readable_project_schema_ids]
+            )
+        )
+        if is_task_snapshot_enabled() and built_task_data_storage:
+            self._insert_snapshots(
+                [
+                    TaskSnapshot(task_id=task_id, project_schema_id=project_schema_id_storage[task_id], data=task_data)
+                    for task_id, task_data in built_task_data_storage.items()
+                ]
+            )
+        task_data_storage.update(built_task_data_storage)
+
+        task_data_list: list[dict] = []
+        for task_id in task_ids:
+            if task_id not in project_schema_id_storage:
+                task_data_list.append({"id": task_id, "task": None, "error": f"Task with id {task_id} not found"})
+            elif project_schema_id_storage[task_id] not in readable_project_schema_ids:
+                task_data_list.append(
+                    {
+                        "id": task_id,
+                        "task": None,
+                        "error": (
+                            f"No read permission {user.username} on project_schema {project_schema_id_storage[task_id]}"
+                        ),
+                    }
+                )
+            else:
+                task_data_list.append({"id": task_id, "task": task_data_storage[task_id], "error": None})
+        return task_data_list
+
+    def get_many(self, task_ids: list[int], user: User) -> list[TaskResultInfo]:
+        task_rows = list(Task.objects.filter(pk__in=task_ids).values_list(*TASK_COLUMNS))
+        project_schema_id_storage = {task_row[0]: task_row[1] for task_row in task_rows}
+        readable_project_schema_ids = self._permission_manager.filter_readable_project_schema_ids(
+            user, set(project_schema_id_storage.values())
+        )
+        task_info_storage = {
+            task_info.id: task_info
+            for task_info in self._get_task_info_list(
+                task_data_builder.get_task_record_table(
+                    [task_row for task_row in task_rows if task_row[1] in readable_project_schema_ids]
+                )
+            )
+        }
+
+        task_result_info_list: list[TaskResultInfo] = []
+        for task_id in task_ids:
+            if task_id in task_info_storage:
+                task_result_info_list.append(TaskResultInfo(id=task_id, task=task_info_storage[task_id]))
+            elif task_id in project_schema_id_storage:
+                task_result_info_list.append(
+                    TaskResultInfo(
+                        id=task_id,
+                        error=(
+                            f"No read permission {user.username} on project_schema {project_schema_id_storage[task_id]}"
+                        ),
+                    )
+                )
+            else:
+                task_result_info_list.append(TaskResultInfo(id=task_id, error=f"Task with id {task_id} not found"))
+        return task_result_info_list
 
-    def filter_task(self, project_id: int) -> list[ShortTaskInfo]:
-        tasks = Task.objects.filter(project_schema__project_id=project_id).order_by("-created")
-        return [self._get_short(task) for task in tasks]
+    def sync_snapshots(self, task_ids) -> None:
+        # Linked tasks embed the short form of their neighbours, including "updated", so their snapshots go stale
+        # on every write to a task they link to.
+        if is_task_snapshot_enabled() and task_ids:
+            self.refresh_snapshots(set(task_ids) | self._get_linked_task_ids(task_ids))
+
+    def _get_linked_task_ids(self, task_ids) -> set[int]:
+        return {
+            linked_task_id
+            for link_task_ids in Link.objects.filter(
+                Q(src_task_id__in=task_ids) | Q(dest_task_id__in=task_ids)
+            ).values_list("src_task_id", "dest_task_id")
+            for linked_task_id in link_task_ids
+        }
 
-    def _get(self, task: Task) -> TaskInfo:
-        project_schema = task.project_schema
+    def refresh_snapshots(self, task_ids) -> list[TaskSnapshot]:
+        return self._save_snapshots(self._build_snapshots(task_ids))
+
+    def rebuild_snapshots(self, task_ids) -> int:
+        # Unlike refresh_snapshots, which runs in the transaction that changed the tasks, a rebuild runs next to task
+        # writes that save newer snapshots. Missing snapshots are only inserted, and existing ones are only replaced
+        # if they were not saved again while the data was built.
+        snapshot_updated_storage = dict(
+            TaskSnapshot.objects.filter(task_id__in=task_ids).values_list("task_id", "updated")
+        )
+        snapshots = self._build_snapshots(task_ids)
+        self._insert_snapshots([snapshot for snapshot in snapshots if snapshot.task_id not in snapshot_updated_storage])
+        snapshots = [snapshot for snapshot in snapshots if snapshot.task_id in snapshot_updated_storage]
+        if not snapshots:
+            return 0
+        data_field = TaskSnapshot._meta.get_field("data")
+        return TaskSnapshot.objects.filter(
+            reduce(
+                operator.or_,
+                (
+                    Q(task_id=snapshot.task_id, updated=snapshot_updated_storage[snapshot.task_id])
+                    for snapshot in snapshots
+                ),
+            )
+        ).update(
+            project_schema_id=Case(
+                *(When(task_id=snapshot.task_id, then=Value(snapshot.project_schema_id)) for snapshot in snapshots)
+            ),
+            data=Case(
+                *(
+                    When(task_id=snapshot.task_id, then=Value(snapshot.data, output_field=data_field))
+                    for snapshot in snapshots
+                ),
+                output_field=data_field,
+            ),
+            updated=timezone.now(),
+        )
 
-        inward_link_info_list = [
-            LinkInfo(id=link.pk, link_type_id=link.link_type_id, linked_task=self._get_short(link.src_task))
-            for link in Link.objects.select_related("src_task").filter(dest_task=task)
+    def _build_snapshots(self, task_ids) -> list[TaskSnapshot]:
+        task_record_table = task_data_builder.get_task_record_table(
+            list(Task.objects.filter(pk__in=task_ids).values_list(*TASK_COLUMNS))
+        )
+        task_data_storage = task_data_builder.get_task_data_storage(task_record_table)
+        return [
+            TaskSnapshot(task_id=task.id, project_schema_id=task.project_schema_id, data=task_data_storage[task.id])
+            for task in task_record_table.tasks
         ]
-        outward_link_info_list = [
-            LinkInfo(id=link.pk, link_type_id=link.link_type_id, linked_task=self._get_short(link.dest_task))
-            for link in Link.objects.select_related("dest_task").filter(src_task=task)
+
+    def _save_snapshots(self, snapshots: list[TaskSnapshot]) -> list[TaskSnapshot]:
+        return TaskSnapshot.objects.bulk_create(
+            snapshots,
+            update_conflicts=True,
+            unique_fields=["task"],
+            update_fields=["project_schema", "data", "updated"],
+        )
+
+    def _insert_snapshots(self, snapshots: list[TaskSnapshot]) -> list[TaskSnapshot]:
+        # Snapshots built on a read miss may be older than one saved by a concurrent write, so they never replace it.
+        return TaskSnapshot.objects.bulk_create(snapshots, ignore_conflicts=True)
+
+    def filter_task_records(self, filter_info: TaskFilterInfo, user: User) -> ShortTaskRecordPage:
+        query_set = self._get_readable_filter_task_query_set(filter_info, user)
+        if query_set is None:
+            return ShortTaskRecordPage(tasks=[], users={}, next_cursor=None)
+        limit = min(max(filter_info.limit, 1), MAX_TASK_PAGE_SIZE)
+        task_rows = list(query_set.values_list(*SHORT_TASK_COLUMNS)[: limit + 1])
+
+        next_cursor = None
+        if len(task_rows) > limit:
+            task_rows = task_rows[:limit]
+            next_cursor = encode_cursor(task_rows[-1][4], task_rows[-1][0])
+
+        return task_data_builder.get_short_task_record_page(task_rows, next_cursor)
+
+    def filter_task_data(self, filter_info: TaskFilterInfo, user: User) -> dict:
+        return task_data_builder.get_short_task_page_data(self.filter_task_records(filter_info, user))
+
+    def filter_task(self, filter_info: TaskFilterInfo, user: User) -> ShortTaskPageInfo:
+        short_task_record_page = self.filter_task_records(filter_info, user)
+        user_storage = self._get_user_storage(short_task_record_page.users)
+        return ShortTaskPageInfo(
+            tasks=[self._get_short_task_info(task, user_storage) for task in short_task_record_page.tasks],
+            next_cursor=short_task_record_page.next_cursor,
+        )
+
+    def _get_readable_filter_task_query_set(self, filter_info: TaskFilterInfo, user: User):
+        project_schema_ids = project_schema_cache.get_project_schema_ids(filter_info.project_id)
+        readable_project_schema_ids = self._permission_manager.filter_readable_project_schema_ids(
+            user, project_schema_ids
+        )
+        if filter_info.task_type_ids:
+            readable_project_schema_ids = {
+                project_schema_id
+                for project_schema_id in readable_project_schema_ids
+                if project_schema_cache.get(project_schema_id).task_type_id in filter_info.task_type_ids
+            }
+        if not readable_project_schema_ids:
+            return None
+        return self._get_filter_task_query_set(
+            filter_info, None if readable_project_schema_ids == project_schema_ids else readable_project_schema_ids
+        )
+
+    def _get_filter_task_query_set(self, filter_info: TaskFilterInfo, project_schema_ids: Optional[set[int]]):
+        query_set = Task.objects.filter(project_id=filter_info.project_id)
+        if project_schema_ids is not None:
+            query_set = query_set.filter(project_schema_id__in=project_schema_ids)
+        if filter_info.status_ids:
+            query_set = query_set.filter(status_id__in=filter_info.status_ids)
+        if filter_info.creator_ids:
+            query_set = query_set.filter(creator_id__in=filter_info.creator_ids)
+        if filter_info.created_from:
+            query_set = query_set.filter(created__gte=filter_info.created_from)
+        if filter_info.created_to:
+            query_set = query_set.filter(created__lt=filter_info.created_to)
+        if filter_info.updated_from:
+            query_set = query_set.filter(updated__gte=filter_info.updated_from)
+        if filter_info.updated_to:
+            query_set = query_set.filter(updated__lt=filter_info.updated_to)
+        field_storage = (
+            Field.objects.select_related("field_type").in_bulk([field_info.id for field_info in filter_info.fields])
+            if filter_info.fields
+            else {}
+        )
+        for field_info in filter_info.fields:
+            field = field_storage.get(field_info.id)
+            field_filters = field_value_indexer.get_filters(field, field_info.value) if field else None
+            if field_filters is None:
+                field_filters = [
+                    Exists(
+                        FieldValue.objects.filter(
+                            task_id=OuterRef("pk"), field_id=field_info.id, value=field_info.value
+                        )
+                    )
+                ]
+            query_set = query_set.filter(*field_filters)
+        if filter_info.cursor:
+            created, pk = decode_cursor(filter_info.cursor)
+            query_set = query_set.filter(Q(created__lt=created) | Q(created=created, pk__lt=pk))
+        return query_set.order_by("-created", "-pk")
+
+    def search_task_records(self, search_info: TaskSearchInfo, user: User) -> TaskSearchRecordPage:
+        limit = min(max(search_info.limit, 1), MAX_TASK_SEARCH_PAGE_SIZE)
+        offset = max(search_info.offset, 0)
+        project_schema_ids = project_schema_cache.get_project_schema_ids(search_info.project_id)
+        readable_project_schema_ids = self._permission_manager.filter_readable_project_schema_ids(
+            user, project_schema_ids
+        )
+        if not readable_project_schema_ids:
+            return TaskSearchRecordPage(tasks=[], users={}, next_offset=None)
+        task_ids = task_search_indexer.search(
+            search_info.project_id,
+            None if readable_project_schema_ids == project_schema_ids else readable_project_schema_ids,
+            search_info.query,
+            limit + 1,
+            offset,
+        )
+
+        next_offset = None
+        if len(task_ids) > limit:
+            task_ids = task_ids[:limit]
+            next_offset = offset + limit
+
+        task_row_storage = {
+            task_row[0]: task_row for task_row in Task.objects.filter(pk__in=task_ids).values_list(*SHORT_TASK_COLUMNS)
+        }
+        return task_data_builder.get_task_search_record_page(
+            [task_row_storage[task_id] for task_id in task_ids if task_id in task_row_storage], next_offset
+        )
+
+    def search_task_data(self, search_info: TaskSearchInfo, user: User) -> dict:
+        return task_data_builder.get_task_search_page_data(self.search_task_records(search_info, user))
+
+    def search_tasks(self, search_info: TaskSearchInfo, user: User) -> TaskSearchPageInfo:
+        task_search_record_page = self.search_task_records(search_info, user)
+        user_storage = self._get_user_storage(task_search_record_page.users)
+        return TaskSearchPageInfo(
+            tasks=[self._get_short_task_info(task, user_storage) for task in task_search_record_page.tasks],
+            next_offset=task_search_record_page.next_offset,
+        )
+
+    def get_task_events(self, filter_info: TaskEventFilterInfo, user: User) -> TaskEventPageInfo:
+        limit = min(max(filter_info.limit, 1), MAX_TASK_EVENT_PAGE_SIZE)
+        task_events = list(self._get_task_event_query_set(filter_info, user)[: limit + 1])
+
+        next_cursor = None
+        if len(task_events) > limit:
+            task_events = task_events[:limit]
+            next_cursor = encode_cursor(task_events[-1].created, task_events[-1].pk)
+
+        return TaskEventPageInfo(events=task_events, next_cursor=next_cursor)
+
+    def iter_task_events(self, filter_info: TaskEventFilterInfo, user: User) -> Iterator[TaskEvent]:
+        return self._get_task_event_query_set(filter_info, user).iterator(chunk_size=TASK_EVENT_STREAM_CHUNK_SIZE)
+
+    def _get_task_event_query_set(self, filter_info: TaskEventFilterInfo, user: User):
+        task = Task.objects.get(pk=filter_info.task_id)
+        self._permission_manager.check_read_permissions(user, project_schema_cache.get(task.project_schema_id))
+
+        query_set = TaskEvent.objects.select_related("user").filter(task_id=task.pk)
+        if filter_info.types:
+            query_set = query_set.filter(type__in=filter_info.types)
+        if filter_info.user_ids:
+            query_set = query_set.filter(user_id__in=filter_info.user_ids)
+        if filter_info.created_from:
+            query_set = query_set.filter(created__gte=filter_info.created_from)
+        if filter_info.created_to:
+            query_set = query_set.filter(created__lt=filter_info.created_to)
+        if filter_info.cursor:
+            created, pk = decode_cursor(filter_info.cursor)
+            query_set = query_set.filter(Q(created__lt=created) | Q(created=created, pk__lt=pk))
+        return query_set.order_by("-created", "-pk")
+
+    async def get_project_activity(self, filter_info: ProjectActivityFilterInfo, user: User) -> ProjectActivityPageInfo:
+        limit = min(max(filter_info.limit, 1), MAX_TASK_EVENT_PAGE_SIZE)
+        query_set = await sync_to_async(self._get_project_activity_query_set)(filter_info, user)
+        if query_set is None:
+            return ProjectActivityPageInfo(events=[], next_cursor=filter_info.after)
+
+        deadline = time.monotonic() + min(max(filter_info.wait, 0), MAX_PROJECT_ACTIVITY_WAIT)
+        version = await activity_notifier.get_version(filter_info.project_id)
+        task_events, settle_timeout = await self._get_settled_task_events(query_set, limit)
+        while not task_events and (timeout := deadline - time.monotonic()) > 0:
+            if settle_timeout is not None:
+                await asyncio.sleep(min(settle_timeout, timeout))
+            elif not await activity_notifier.wait(filter_info.project_id, version, timeout):
+                continue
+            version = await activity_notifier.get_version(filter_info.project_id)
+            task_events, settle_timeout = await self._get_settled_task_events(query_set, limit)
+
+        next_cursor = task_events[-1].pk if task_events else filter_info.after
+        return ProjectActivityPageInfo(events=task_events, next_cursor=next_cursor)
+
+    async def _get_settled_task_events(self, query_set, limit: int) -> tuple[list[TaskEvent], Optional[float]]:
+        # Events are paged by id, but ids are assigned on insert and become visible on commit, so an event with a lower
+        # id may still be uncommitted when a later one is visible. Events are only returned once they are older than
+        # the settle time, and the page stops at the first newer one, so the cursor does not move past events of
+        # transactions that are still committing. Also returns the seconds until that event settles.
+        settle_time = getattr(settings, "SHARK_TASK_ACTIVITY_SETTLE_TIME", PROJECT_ACTIVITY_SETTLE_TIME)
+        settled_before = timezone.now() - timedelta(seconds=settle_time)
+        task_events = [task_event async for task_event in query_set[:limit]]
+        for index, task_event in enumerate(task_events):
+            if task_event.created > settled_before:
+                return task_events[:index], (task_event.created - settled_before).total_seconds()
+        return task_events, None
+
+    def _get_project_activity_query_set(self, filter_info: ProjectActivityFilterInfo, user: User):
+        project_schema_ids = project_schema_cache.get_project_schema_ids(filter_info.project_id)
+        readable_project_schema_ids = self._permission_manager.filter_readable_project_schema_ids(
+            user, project_schema_ids
+        )
+        if not readable_project_schema_ids:
+            return None
+
+        query_set = TaskEvent.objects.select_related("user").filter(project_id=filter_info.project_id)
+        if readable_project_schema_ids != project_schema_ids:
+            query_set = query_set.filter(task__project_schema_id__in=readable_project_schema_ids)
+        return query_set.filter(pk__gt=filter_info.after).order_by("pk")
+
+    def get_link_graph_record(self, filter_info: LinkGraphFilterInfo, user: User) -> LinkGraphRecord:
+        max_depth = min(max(filter_info.max_depth, 0), MAX_LINK_GRAPH_DEPTH)
+        max_nodes = min(max(filter_info.max_nodes, 1), MAX_LINK_GRAPH_NODE_COUNT)
+        root_task_row = Task.objects.values_list(*SHORT_TASK_COLUMNS).get(pk=filter_info.task_id)
+        self._permission_manager.check_read_permissions(user, project_schema_cache.get(root_task_row[1]))
+
+        node_row_storage: dict[int, tuple[tuple, int]] = {root_task_row[0]: (root_task_row, 0)}
+        edge_storage: dict[int, LinkGraphEdgeRecord] = {}
+        unreadable_task_ids: set[int] = set()
+        is_truncated = False
+        frontier = {root_task_row[0]}
+        for depth in range(1, max_depth + 1):
+            if not frontier:
+                break
+            new_edges: list[LinkGraphEdgeRecord] = []
+            new_task_ids: set[int] = set()
+            for link_row in (
+                self._get_link_graph_query_set(filter_info, frontier)
+                .order_by("pk")
+                .values_list("pk", "link_type_id", "src_task_id", "dest_task_id")
+            ):
+                edge = LinkGraphEdgeRecord._make(link_row)
+                if edge.id in edge_storage:
+                    continue
+                new_edges.append(edge)
+                for task_id in (edge.src_task_id, edge.dest_task_id):
+                    if task_id not in node_row_storage and task_id not in unreadable_task_ids:
+                        new_task_ids.add(task_id)
+
+            if len(node_row_storage) + len(new_task_ids) > max_nodes:
+                is_truncated = True
+                new_task_ids = set(sorted(new_task_ids)[: max_nodes - len(node_row_storage)])
+
+            new_task_rows = (
+                list(Task.objects.filter(pk__in=new_task_ids).values_list(*SHORT_TASK_COLUMNS)) if new_task_ids else []
+            )
+            readable_project_schema_ids = self._permission_manager.filter_readable_project_schema_ids(
+                user, {task_row[1] for task_row in new_task_rows}
+            )
+            new_task_rows = [task_row for task_row in new_task_rows if task_row[1] in readable_project_schema_ids]
+            unreadable_task_ids |= new_task_ids - {task_row[0] for task_row in new_task_rows}
+            for task_row in new_task_rows:
+                node_row_storage[task_row[0]] = (task_row, depth)
+            for edge in new_edges:
+                if edge.src_task_id in node_row_storage and edge.dest_task_id in node_row_storage:
+                    edge_storage[edge.id] = edge
+            frontier = {task_row[0] for task_row in new_task_rows}
+            if is_truncated:
+                break
+        else:
+            is_truncated = (
+                bool(frontier)
+                and self._get_link_graph_query_set(filter_info, frontier).exclude(pk__in=edge_storage.keys()).exists()
+            )
+
+        edges = list(edge_storage.values())
+        return task_data_builder.get_link_graph_record(
+            list(node_row_storage.values()),
+            edges,
+            has_cycle=self._has_cycle(node_row_storage.keys(), edges),
+            is_truncated=is_truncated,
+        )
+
+    def get_link_graph_data(self, filter_info: LinkGraphFilterInfo, user: User) -> dict:
+        return task_data_builder.get_link_graph_data(self.get_link_graph_record(filter_info, user))
+
+    def get_link_graph(self, filter_info: LinkGraphFilterInfo, user: User) -> LinkGraphInfo:
+        link_graph_record = self.get_link_graph_record(filter_info, user)
+        user_storage = self._get_user_storage(link_graph_record.users)
+        return LinkGraphInfo(
+            nodes=[
+                LinkGraphNodeInfo(task=self._get_short_task_info(node.task, user_storage), depth=node.depth)
+                for node in link_graph_record.nodes
+            ],
+            edges=[LinkGraphEdgeInfo(**edge._asdict()) for edge in link_graph_record.edges],
+            has_cycle=link_graph_record.has_cycle,
+            is_truncated=link_graph_record.is_truncated,
+        )
+
+    def _get_link_graph_query_set(self, filter_info: LinkGraphFilterInfo, task_ids: set[int]):
+        link_filter = Q()
+        if filter_info.direction in (LinkDirection.OUTWARD, LinkDirection.BOTH):
+            link_filter |= Q(src_task_id__in=task_ids)
+        if filter_info.direction in (LinkDirection.INWARD, LinkDirection.BOTH):
+            link_filter |= Q(dest_task_id__in=task_ids)
+        query_set = Link.objects.filter(link_filter)
+        if filter_info.link_type_ids:
+            query_set = query_set.filter(link_type_id__in=filter_info.link_type_ids)
+        return query_set
+
+    def _has_cycle(self, task_ids, edges: list[LinkGraphEdgeRecord]) -> bool:
+        dest_task_id_storage: dict[int, list[int]] = {task_id: [] for task_id in task_ids}
+        for edge in edges:
+            dest_task_id_storage[edge.src_task_id].append(edge.dest_task_id)
+
+        visited_task_ids: set[int] = set()
+        for root_task_id in dest_task_id_storage:
+            if root_task_id in visited_task_ids:
+                continue
+            path_task_ids = {root_task_id}
+            stack = [(root_task_id, iter(dest_task_id_storage[root_task_id]))]
+            visited_task_ids.add(root_task_id)
+            while stack:
+                task_id, dest_task_ids = stack[-1]
+                dest_task_id = next(dest_task_ids, None)
+                if dest_task_id is None:
+                    stack.pop()
+                    path_task_ids.discard(task_id)
+                elif dest_task_id in path_task_ids:
+                    return True
+                elif dest_task_id not in visited_task_ids:
+                    visited_task_ids.add(dest_task_id)
+                    path_task_ids.add(dest_task_id)
+                    stack.append((dest_task_id, iter(dest_task_id_storage[dest_task_id])))
+        return False
+
+    def _get(self, task_id: int) -> TaskInfo:
+        return self._get_task_info_list(
+            task_data_builder.get_task_record_table([Task.objects.values_list(*TASK_COLUMNS).get(pk=task_id)])
+        )[0]
+
+    def _get_task_info_list(self, task_record_table: TaskRecordTable) -> list[TaskInfo]:
+        user_storage = self._get_user_storage(task_record_table.users)
+        status_storage = Status.objects.select_related("status_type").in_bulk(task_record_table.statuses)
+        return [
+            TaskInfo(
+                id=task.id,
+                project_id=task.project_id,
+                task_type_id=task.task_type_id,
+                creator=user_storage[task.creator_id],
+                summary=task.summary,
+                status=status_storage[task.status_id],
+                key=task.key,
+                task_num=task.task_num,
+                fields=[FieldValueInfo(id=field.id, value=field.value) for field in task.fields],
+                inward_links=[self._get_link_info(link, user_storage) for link in task.inward_links],
+                outward_links=[self._get_link_info(link, user_storage) for link in task.outward_links],
+                created=task.created,
+                updated=task.updated,
+            )
+            for task in task_record_table.tasks
         ]
 
-        return TaskInfo(
-            id=task.pk,
-            project_id=project_schema.project_id,
-            task_type_id=project_schema.task_type_id,
-            creator=task.creator,
-            summary=task.summary,
-            status=task.status,
-            key=task.key,
-            task_num=task.task_num,
-            fields=self._get_field_info_list(project_schema, task),
-            inward_links=inward_link_info_list,
-            outward_links=outward_link_info_list,
-            created=task.created,
-            updated=task.updated,
+    def _get_link_info(self, link: LinkRecord, user_storage: dict[int, User]) -> LinkInfo:
+        return LinkInfo(
+            id=link.id,
+            link_type_id=link.link_type_id,
+            linked_task=self._get_short_task_info(link.linked_task, user_storage),
         )
 
-    def _get_short(self, task: Task) -> ShortTaskInfo:
+    def _get_short_task_info(self, task: ShortTaskRecord, user_storage: dict[int, User]) -> ShortTaskInfo:
         return ShortTaskInfo(
-            id=task.pk,
-            project_id=task.project_schema.project_id,
-            task_type_id=task.project_schema.task_type_id,
-            creator=task.creator,
+            id=task.id,
+            project_id=task.project_id,
+            task_type_id=task.task_type_id,
+            creator=user_storage[task.creator_id],
             summary=task.summary,
             created=task.created,
             updated=task.updated,
         )
 
-    def get_max_task_num(self, project_id: int) -> int:
+    def _get_user_storage(self, user_record_storage: dict[int, UserRecord]) -> dict[int, User]:
+        # Users are built from the loaded columns only; the other fields are deferred like with .only().
+        database = router.db_for_read(User)
+        return {user_id: User.from_db(database, USER_COLUMNS, user) for user_id, user in user_record_storage.items()}
+
+    def reserve_task_nums(self, project_id: int, count: int = 1) -> int:
+        # Numbers are reserved in their own transaction right before the tasks are inserted, so the sequence row is not
+        # locked while the rest of the task is written. Numbers of tasks whose insert is rolled back are not reused.
+        with transaction.atomic():
+            task_num_sequence, _ = TaskNumSequence.objects.select_for_update().get_or_create(
+                project_id=project_id, defaults={"last_task_num": lambda: self._get_max_task_num(project_id)}
+            )
+            first_task_num = task_num_sequence.last_task_num + 1
+            task_num_sequence.last_task_num += count
+            task_num_sequence.save(update_fields=["last_task_num", "updated"])
+        return first_task_num
+
+    def _get_max_task_num(self, project_id: int) -> int:
         max_task_num = 0
-        if task := Task.objects.filter(project_schema__project_id=project_id).order_by("-task_num").first():
+        if task := Task.objects.filter(project_id=project_id).order_by("-task_num").first():
             max_task_num = task.task_num
         return max_task_num
 
-    def generate_task_key(self, project: Project, task_num: int) -> str:
-        return f"{project.key}-{task_num}"
+    def generate_task_key(self, project_key: str, task_num: int) -> str:
+        return f"{project_key}-{task_num}"
 
     def get_transitions(self, task_id: int, user: User) -> list[Transition]:
-        task = Task.objects.select_related("project_schema").get(pk=task_id)
+        task = Task.objects.get(pk=task_id)
+        project_schema = project_schema_cache.get(task.project_schema_id)
+        self._permission_manager.check_read_permissions(user, project_schema)
         out_transitions = list(
             filter(
                 lambda transition: self._check_transition(task, user, transition),
-                self._get_out_transitions_query_set(task),
+                workflow_cache.get(project_schema.workflow_id).get_out_transitions(task.status_id),
             )
         )
         return out_transitions
 
     def transit(self, task_id: int, transition_id: int, user: User) -> None:
         with transaction.atomic():
-            task = Task.objects.select_related("status", "project_schema").get(pk=task_id)
-            transition = self._get_out_transitions_query_set(task).get(pk=transition_id)
+            task = Task.objects.get(pk=task_id)
+            project_schema = project_schema_cache.get(task.project_schema_id)
+            workflow = workflow_cache.get(project_schema.workflow_id)
+            transition = workflow.get_out_transition(task.status_id, transition_id)
+            self._permission_manager.check_write_permissions(user, project_schema)
             if not self._check_transition(task, user, transition):
                 raise ValueError(f"Condition check failed for transition with id {transition_id}")
 
-            self._execute_postfucntions(task, user, transition, is_pre_transit=True)
+            self._execute_postfucntions([task], user, transition, is_pre_transit=True)
 
             task_event = TaskEvent.objects.create(
                 task=task,
+                project_id=project_schema.project_id,
                 type=TaskEventType.STATUS_UPDATED,
                 user=user,
-                old_value=StatusSerializer(task.status).data,
-                new_value=StatusSerializer(transition.dest_status).data,
+                old_value=workflow.get_serialized_status(task.status_id),
+                new_value=workflow.get_serialized_status(transition.dest_status_id),
             )
             task.status = transition.dest_status
             task.save()
 
-            self._execute_postfucntions(task, user, transition, is_pre_transit=False)
+            self._execute_postfucntions([task], user, transition, is_pre_transit=False)
 
-            self._notify_task_subscribers(task, [task_event], user, task.project_schema.event_listeners)
+            self._notify_task_subscribers([task_event], user, project_schema.event_listeners)
+            self.sync_snapshots([task.pk])
 
-    def _get_out_transitions_query_set(self, task: Task) -> list[Transition]:
-        return (
-            Transition.objects.filter(workflow_id=task.project_schema.workflow_id)
-            .filter(Q(src_status_id=task.status_id) | Q(src_status_id__isnull=True))
-            .exclude(is_initial=True)
-        )
+    def bulk_transit(self, task_ids: list[int], transition_id: int, user: User) -> list[TransitResultInfo]:
+        task_ids = list(dict.fromkeys(task_ids))
+        result_storage: dict[int, TransitResultInfo] = {}
+        with transaction.atomic():
+            task_storage = Task.objects.select_for_update().in_bulk(task_ids)
+            checked_project_schema_ids: set[int] = set()
+            transition = None
+            candidate_tasks: list[Task] = []
+            for task_id in task_ids:
+                task = task_storage.get(task_id)
+                try:
+                    if task is None:
+                        raise Task.DoesNotExist(f"Task with id {task_id} does not exist")
+                    project_schema = project_schema_cache.get(task.project_schema_id)
+                    if project_schema.id not in checked_project_schema_ids:
+                        self._permission_manager.check_write_permissions(user, project_schema)
+                        checked_project_schema_ids.add(project_schema.id)
+                    transition = workflow_cache.get(project_schema.workflow_id).get_out_transition(
+                        task.status_id, transition_id
+                    )
+                except (Task.DoesNotExist, Transition.DoesNotExist, PermissionError) as e:
+                    result_storage[task_id] = TransitResultInfo(id=task_id, error=str(e))
+                    continue
+                candidate_tasks.append(task)
 
-    def _check_transition(self, task: Task, user: User, transition: Transition) -> bool:
-        is_checked = True
-        if condition_info_list := transition.conditions:
-            condition_info_list = sorted(condition_info_list, key=lambda x: x["priority"])
-            for condition_info in condition_info_list:
-                condition: Condition = create_instance(
-                    condition_info["class"], condition_info.get("args", []), condition_info.get("kwargs", {})
+            transitable_task_ids = (
+                self._filter_transitable_task_ids(candidate_tasks, user, transition) if candidate_tasks else set()
+            )
+            transited_task_storage: dict[int, list[Task]] = {}
+            for task in candidate_tasks:
+                if task.pk in transitable_task_ids:
+                    transited_task_storage.setdefault(task.project_schema_id, []).append(task)
+                else:
+                    result_storage[task.pk] = TransitResultInfo(
+                        id=task.pk, error=f"Condition check failed for transition with id {transition_id}"
+                    )
+
+            if transited_task_storage:
+                workflow = workflow_cache.get(transition.workflow_id)
+                tasks = [
+                    task for project_schema_tasks in transited_task_storage.values() for task in project_schema_tasks
+                ]
+                self._execute_postfucntions(tasks, user, transition, is_pre_transit=True)
+
+                task_events = [
+                    TaskEvent(
+                        task=task,
+                        project_id=task.project_id,
+                        type=TaskEventType.STATUS_UPDATED,
+                        user=user,
+                        old_value=workflow.get_serialized_status(task.status_id),
+                        new_value=workflow.get_serialized_status(transition.dest_status_id),
+                    )
+                    for task in tasks
+                ]
+                now = timezone.now()
+                Task.objects.filter(pk__in=[task.pk for task in tasks]).update(
+                    status_id=transition.dest_status_id, updated=now
                 )
-                is_checked = condition.is_active(task, user)
-        return is_checked
+                self._bulk_create_task_events(task_events)
 
-    def _execute_postfucntions(self, task: Task, user: User, transition: Transition, is_pre_transit: bool) -> None:
-        try:
-            if postfunction_info_list := transition.postfunctions:
-                filtered_postfunction_info_list = []
-                for postfunction_info in postfunction_info_list:
-                    if is_pre_transit and postfunction_info["priority"] < 0:
-                        filtered_postfunction_info_list.append(postfunction_info)
-                    elif not is_pre_transit and postfunction_info["priority"] >= 0:
-                        filtered_postfunction_info_list.append(postfunction_info)
-                filtered_postfunction_info_list = sorted(filtered_postfunction_info_list, key=lambda x: x["priority"])
-                for postfunction_info in filtered_postfunction_info_list:
-                    postfunction: Postfunction = create_instance(
-                        postfunction_info["class"],
-                        postfunction_info.get("args", []),
-                        postfunction_info.get("kwargs", {}),
+                for task in tasks:
+                    task.status = transition.dest_status
+                    task.updated = now
+                    result_storage[task.pk] = TransitResultInfo(id=task.pk, status=transition.dest_status)
+                self._execute_postfucntions(tasks, user, transition, is_pre_transit=False)
+
+                task_event_storage = {task_event.task_id: task_event for task_event in task_events}
+                for project_schema_id, project_schema_tasks in transited_task_storage.items():
+                    self._notify_task_subscribers(
+                        [task_event_storage[task.pk] for task in project_schema_tasks],
+                        user,
+                        project_schema_cache.get(project_schema_id).event_listeners,
                     )
-                    postfunction.execute(task, user)
+                self.sync_snapshots([task.pk for task in tasks])
+
+        return [result_storage[task_id] for task_id in task_ids]
+
+    def _check_transition(self, task: Task, user: User, transition: Transition) -> bool:
+        return task.pk in self._filter_transitable_task_ids([task], user, transition)
+
+    def _filter_transitable_task_ids(self, tasks: list[Task], user: User, transition: Transition) -> set[int]:
+        task_ids = {task.pk for task in tasks}
+        for condition_info in get_plugin_info_list(
+            ("transition_conditions", transition.pk), transition.conditions, transition.updated
+        ):
+            if not task_ids:
+                break
+            task_ids &= get_active_task_ids(
+                condition_info.create_instance(), [task for task in tasks if task.pk in task_ids], user
+            )
+        return task_ids
+
+    def _execute_postfucntions(
+        self, tasks: list[Task], user: User, transition: Transition, is_pre_transit: bool
+    ) -> None:
+        try:
+            for postfunction_info in get_plugin_info_list(
+                ("transition_postfunctions", transition.pk), transition.postfunctions, transition.updated
+            ):
+                if is_pre_transit != (postfunction_info.priority < 0):
+                    continue
+                execute_postfunction(postfunction_info.create_instance(), tasks, user)
         except Exception as e:
             logger = logging.getLogger()
             logger.error(e)
             print(e)
 
+    def _bulk_create_task_events(self, task_events: list[TaskEvent]) -> list[TaskEvent]:
+        # Event deliveries refer to task events by primary key, which backends that cannot return rows from bulk
+        # inserts leave unset. Task events have no unique columns to select them again by, so they are saved one by one
+        # on those backends.
+        if connections[router.db_for_write(TaskEvent)].features.can_return_rows_from_bulk_insert:
+            return TaskEvent.objects.bulk_create(task_events)
+        for task_event in task_events:
+            task_event.save()
+        return task_events
+
     def _notify_task_subscribers(
-        self, task: Task, task_events: list[TaskEvent], user: User, event_listener_info_list: Optional[list[dict]]
+        self, task_events: list[TaskEvent], user: User, event_listener_info_list: Optional[list[dict]]
     ) -> None:
-        if event_listener_info_list:
-            event_listener_info_list = sorted(event_listener_info_list, key=lambda x: x["priority"])
-            for event_listener_info in event_listener_info_list:
-                event_listener: EventListener = create_instance(
-                    event_listener_info["class"],
-                    event_listener_info.get("args", []),
-                    event_listener_info.get("kwargs", {}),
-                )
-                event_listener.notify(task, task_events, user)
-
-    def _get_field_info_list(self, project_schema: ProjectSchema, task: Task) -> list[FieldValueInfo]:
-        field_value_storage: dict[int, dict] = {
-            field_value.field.pk: field_value.value
-            for field_value in FieldValue.objects.select_related("field").filter(task=task, value__isnull=False)
-        }
+        activity_notifier.notify_on_commit(task_events)
+        task_event_dispatcher.enqueue(task_events, user, event_listener_info_list)
 
-        field_info_list: list[FieldValueInfo] = []
-        for field in project_schema.screen.fields.all():
-            field_info_list.append(FieldValueInfo(id=field.pk, value=field_value_storage.get(field.pk)))
-        return field_info_list
-
-    def _validate_field_info_list_during_creation(self, screen: Screen, field_info_list: list[FieldValueInfo]) -> None:
-        required_field_storage = self._get_required_field_storage(screen)
+    def _validate_field_info_list_during_creation(
+        self, project_schema: ProjectSchemaSnapshot, field_info_list: list[FieldValueInfo]
+    ) -> None:
         filled_field_id_set = {field_info.id for field_info in field_info_list if field_info.value is not None}
-        for _, required_field in required_field_storage.items():
+        for _, required_field in project_schema.required_field_storage.items():
             if required_field.pk not in filled_field_id_set:
                 raise ValueError(f"Field {required_field.name} is required")
 
-    def _validate_field_info_list_during_update(self, screen: Screen, field_info_list: list[FieldValueInfo]) -> None:
-        required_field_storage = self._get_required_field_storage(screen)
+    def _validate_field_info_list_during_update(
+        self, project_schema: ProjectSchemaSnapshot, field_info_list: list[FieldValueInfo]
+    ) -> None:
+        required_field_storage = project_schema.required_field_storage
 
         for field_info in field_info_list:
             if field_info.id in required_field_storage and field_info.value is None:
                 required_field = required_field_storage[field_info.id]
                 raise ValueError(f"Field {required_field.name} is required")
 
-    def _get_required_field_storage(self, screen: Screen) -> dict[int, Field]:
-        return {field.pk: field for field in screen.fields.filter(screen_field_schemas__is_required=True)}
+    def _get_off_screen_field_storage(self, task_info_list: list[CreateTaskInfo]) -> dict[int, Field]:
+        field_ids = {field_info.id for task_info in task_info_list for field_info in task_info.fields}
+        for task_info in task_info_list:
+            try:
+                project_schema = project_schema_cache.get_active(task_info.project_id, task_info.task_type_id)
+            except ProjectSchema.DoesNotExist:
+                continue
+            field_ids -= project_schema.field_storage.keys()
+        return Field.objects.select_related("field_type").in_bulk(field_ids) if field_ids else {}
 
-    def _get_initial_status(self, project_schema: ProjectSchema) -> Status:
-        initial_transition = Transition.objects.select_related("dest_status__status_type").get(
-            workflow_id=project_schema.workflow_id, is_initial=True
-        )
-        return initial_transition.dest_status
+    def _get_field_storage(self, project_schema: ProjectSchemaSnapshot, field_ids: list[int]) -> dict[int, Field]:
+        field_storage = {
+            field_id: project_schema.field_storage[field_id]
+            for field_id in field_ids
+            if field_id in project_schema.field_storage
+        }
+        if off_screen_field_ids := set(field_ids) - field_storage.keys():
+            field_storage.update(Field.objects.select_related("field_type").in_bulk(off_screen_field_ids))
+            if missing_field_ids := off_screen_field_ids - field_storage.keys():
+                raise Field.DoesNotExist(f"Fields {sorted(missing_field_ids)} do not exist")
+        return field_storage
+
+    def _get_field(self, project_schema: ProjectSchemaSnapshot, field_id: int) -> Field:
+        if field := project_schema.field_storage.get(field_id):
+            return field
+        return Field.objects.select_related("field_type").get(pk=field_id)
@@ -0,0 +1,693 @@
+import asyncio
+import os
+import time
+import timeit
+from datetime import timedelta
+from unittest import mock, skipUnless
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings, tag
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.renderers import JSONRenderer
+
+from django_shark_task.fields.models import Field, Screen, ScreenField
+from django_shark_task.task.activity_notifier import activity_notifier
+from django_shark_task.task.const import PROJECT_ACTIVITY_POLL_INTERVAL, LinkDirection
+from django_shark_task.task.event_dispatcher import task_event_dispatcher
+from django_shark_task.task.link_manager import CreateLinkInfo, LinkManager
+from django_shark_task.task.models import (
+    Link,
+    LinkType,
+    Project,
+    ProjectSchema,
+    Task,
+    TaskEvent,
+    TaskEventDelivery,
+    TaskEventDeliveryStatus,
+    TaskEventType,
+    TaskSnapshot,
+    TaskType,
+)
+from django_shark_task.task.project_schema_cache import project_schema_cache
+from django_shark_task.task.serializers import (
+    LinkGraphSerializer,
+    ShortTaskSerializer,
+    TaskEventSerializer,
+    TaskSearchPageSerializer,
+    TaskSerializer,
+)
+from django_shark_task.task.task_data import task_data_builder
+from django_shark_task.task.task_manager import (
+    CreateTaskInfo,
+    LinkGraphFilterInfo,
+    ProjectActivityFilterInfo,
+    TaskEventFilterInfo,
+    TaskFilterInfo,
+    TaskManager,
+    TaskSearchInfo,
+    UpdateTaskInfo,
+)
+from django_shark_task.task.views import ProjectActivityView, get_task_events
+from django_shark_task.utils.pagination import encode_cursor
+from django_shark_task.utils.renderers import ORJSONRenderer
+from django_shark_task.utils.versioned_cache import VersionedCache
+from django_shark_task.workflow.models import Workflow
+from django_shark_task.workflow.workflow_cache import workflow_cache
+
+User = get_user_model()
+
+
+class TaskTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username="user")
+        cls.project = Project.objects.create(key="P", name="Project")
+        cls.task_type = TaskType.objects.get(name="Task")
+        screen = Screen.objects.create(name="Screen")
+        for priority, field in enumerate(Field.objects.order_by("pk")):
+            ScreenField(screen=screen, field=field, is_required=field.key == "description", priority=priority).save()
+        cls.project_schema = ProjectSchema.objects.create(
+            is_active=True, project=cls.project, task_type=cls.task_type, screen=screen, workflow=Workflow.objects.get()
+        )
+        cls.description_field = Field.objects.get(key="description")
+        cls.link_type = LinkType.objects.create(src_name="blocks", dest_name="is blocked by")
+
+    def setUp(self):
+        project_schema_cache.invalidate()
+        workflow_cache.invalidate()
+        self.task_manager = TaskManager()
+        self.link_manager = LinkManager()
+
+    def create_task(self, summary: str = "Task") -> int:
+        return self.task_manager.create(
+            CreateTaskInfo(
+                project_id=self.project.pk,
+                task_type_id=self.task_type.pk,
+                summary=summary,
+                fields=[{"id": self.description_field.pk, "value": {"value": f"{summary} description"}}],
+            ),
+            self.user,
+        ).id
+
+    def create_linked_task(self, link_count: int) -> int:
+        task_id = self.create_task()
+        for index in range(link_count):
+            linked_task_id = self.create_task(f"Linked task {index}")
+            if index % 2:
+                self.link_manager.create(self.link_type.pk, task_id, linked_task_id, self.user)
+            else:
+                self.link_manager.create(self.link_type.pk, linked_task_id, task_id, self.user)
+        return task_id
+
+
+class TaskQueryCountTestCase(TaskTestCase):
+    def test_get_data_query_count_does_not_depend_on_link_count(self):
+        for link_count in (1, 10):
+            with self.subTest(link_count=link_count):
+                task_id = self.create_linked_task(link_count)
+                self.task_manager.get_data(task_id, self.user)
+
+                with self.assertNumQueries(4):
+                    task_data = self.task_manager.get_data(task_id, self.user)
+                self.assertEqual(len(task_data["inward_links"]) + len(task_data["outward_links"]), link_count)
+                self.assertEqual(len(task_data["fields"]), Field.objects.count())
+
+    def test_filter_task_data_query_count_does_not_depend_on_task_count(self):
+        filter_info = TaskFilterInfo(project_id=self.project.pk)
+        for task_count in (1, 10):
+            with self.subTest(task_count=task_count):
+                for index in range(task_count):
+                    self.create_task(f"Task {index}")
+                self.task_manager.filter_task_data(filter_info, self.user)
+
+                with self.assertNumQueries(2):
+                    task_page_data = self.task_manager.filter_task_data(filter_info, self.user)
+                self.assertEqual(len(task_page_data["tasks"]), Task.objects.filter(project=self.project).count())
+
+
+class LinkBulkCreateTestCase(TaskTestCase):
+    def test_bulk_create_does_not_report_concurrently_created_link(self):
+        src_task_id = self.create_task("Source")
+        dest_task_id = self.create_task("Destination")
+        select_for_update = Task.objects.select_for_update
+        concurrent_links: list[Link] = []
+        is_concurrent_request_started = False
+
+        # The concurrent request commits its link while this request waits for the task row locks.
+        def select_for_update_after_concurrent_create(*args, **kwargs):
+            nonlocal is_concurrent_request_started
+            if not is_concurrent_request_started:
+                is_concurrent_request_started = True
+                concurrent_links.append(
+                    self.link_manager.create(self.link_type.pk, src_task_id, dest_task_id, self.user)
+                )
+            return select_for_update(*args, **kwargs)
+
+        with mock.patch.object(
+            Task.objects, "select_for_update", side_effect=select_for_update_after_concurrent_create
+        ):
+            results = self.link_manager.bulk_create(
+                [CreateLinkInfo(link_type_id=self.link_type.pk, src_task_id=src_task_id, dest_task_id=dest_task_id)],
+                self.user,
+            )
+
+        self.assertEqual(results[0].id, concurrent_links[0].pk)
+        self.assertIs(results[0].is_created, False)
+        self.assertIsNone(results[0].error)
+        self.assertEqual(
+            TaskEvent.objects.filter(task_id=src_task_id, type=TaskEventType.LINK_CREATED).count(),
+            1,
+        )
+
+
+class TaskIndexTestCase(TaskTestCase):
+    def get_index_name(self, model, fields: list[str]) -> str:
+        return next(index.name for index in model._meta.indexes if index.fields == fields)
+
+    def explain_postgresql(self, sql: str, params=()) -> str:
+        # Test tables are tiny, so sequential scans and sorts are disabled to make the planner pick an index if one
+        # can serve the query.
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_sort = off")
+            cursor.execute(f"EXPLAIN {sql}", params)
+            return "\n".join(row[0] for row in cursor.fetchall())
+
+    def get_filter_task_info_list(self) -> list[TaskFilterInfo]:
+        task_id = self.create_task()
+        cursor = encode_cursor(Task.objects.get(pk=task_id).created, task_id)
+        return [TaskFilterInfo(project_id=self.project.pk), TaskFilterInfo(project_id=self.project.pk, cursor=cursor)]
+
+    def get_task_event_filter_info_list(self) -> list[TaskEventFilterInfo]:
+        task_id = self.create_task()
+        task_event = TaskEvent.objects.filter(task_id=task_id).latest("pk")
+        return [
+            TaskEventFilterInfo(task_id=task_id),
+            TaskEventFilterInfo(task_id=task_id, cursor=encode_cursor(task_event.created, task_event.pk)),
+        ]
+
+    @skipUnless(connection.vendor == "sqlite", "SQLite query plan")
+    def test_filter_task_uses_project_created_index(self):
+        for filter_info in self.get_filter_task_info_list():
+            with self.subTest(cursor=filter_info.cursor):
+                query_plan = self.task_manager._get_filter_task_query_set(filter_info, None).explain()
+                self.assertIn(self.get_index_name(Task, ["project", "created", "id"]), query_plan)
+                self.assertNotIn("USE TEMP B-TREE FOR ORDER BY", query_plan)
+
+    @skipUnless(connection.vendor == "sqlite", "SQLite query plan")
+    def test_task_events_use_task_created_index(self):
+        for filter_info in self.get_task_event_filter_info_list():
+            with self.subTest(cursor=filter_info.cursor):
+                query_plan = self.task_manager._get_task_event_query_set(filter_info, self.user).explain()
+                self.assertIn(self.get_index_name(TaskEvent, ["task", "created", "id"]), query_plan)
+                self.assertNotIn("USE TEMP B-TREE FOR ORDER BY", query_plan)
+
+    @skipUnless(connection.vendor == "postgresql", "PostgreSQL query plan")
+    def test_filter_task_uses_project_created_index_on_postgresql(self):
+        for filter_info in self.get_filter_task_info_list():
+            with self.subTest(cursor=filter_info.cursor):
+                query_plan = self.explain_postgresql(
+                    *self.task_manager._get_filter_task_query_set(filter_info, None).query.sql_with_params()
+                )
+                self.assertIn(self.get_index_name(Task, ["project", "created", "id"]), query_plan)
+                self.assertNotIn("Sort", query_plan)
+
+    @skipUnless(connection.vendor == "postgresql", "PostgreSQL query plan")
+    def test_task_events_use_task_created_index_on_postgresql(self):
+        for filter_info in self.get_task_event_filter_info_list():
+            with self.subTest(cursor=filter_info.cursor):
+                query_plan = self.explain_postgresql(
+                    *self.task_manager._get_task_event_query_set(filter_info, self.user).query.sql_with_params()
+                )
+                self.assertIn(self.get_index_name(TaskEvent, ["task", "created", "id"]), query_plan)
+                self.assertNotIn("Sort", query_plan)
+
+    @skipUnless(connection.vendor == "postgresql", "PostgreSQL query plan")
+    def test_project_activity_uses_project_index_on_postgresql(self):
+        self.create_task()
+        query_set = self.task_manager._get_project_activity_query_set(
+            ProjectActivityFilterInfo(project_id=self.project.pk), self.user
+        )
+        query_plan = self.explain_postgresql(*query_set[:10].query.sql_with_params())
+        self.assertIn(self.get_index_name(TaskEvent, ["project", "id"]), query_plan)
+        self.assertNotIn("Sort", query_plan)
+
+    @skipUnless(connection.vendor == "postgresql", "PostgreSQL query plan")
+    def test_task_links_use_task_indexes_on_postgresql(self):
+        task_id = self.create_linked_task(2)
+        with CaptureQueriesContext(connection) as captured_queries:
+            self.task_manager.get_data(task_id, self.user)
+        link_queries = [query["sql"] for query in captured_queries if f'FROM "{Link._meta.db_table}"' in query["sql"]]
+
+        self.assertTrue(link_queries)
+        for sql in link_queries:
+            with self.subTest(sql=sql):
+                self.assertNotIn("Seq Scan", self.explain_postgresql(sql))
+
+
+@override_settings(SHARK_TASK_SNAPSHOTS=True)
+class TaskSnapshotTestCase(TaskTestCase):
+    def get_task_data(self, task_id: int) -> dict:
+        with self.settings(SHARK_TASK_SNAPSHOTS=False):
+            return self.task_manager.get_data(task_id, self.user)
+
+    def test_linked_task_snapshot_is_refreshed_on_every_write(self):
+        task_id = self.create_task()
+        linked_task_id = self.create_task("Linked task")
+        self.link_manager.create(self.link_type.pk, task_id, linked_task_id, self.user)
+        transition = self.task_manager.get_transitions(task_id, self.user)[0]
+
+        for write in (
+            lambda: self.task_manager.transit(task_id, transition.pk, self.user),
+            lambda: self.task_manager.update(
+                task_id,
+                UpdateTaskInfo(fields=[{"id": self.description_field.pk, "value": {"value": "Updated"}}]),
+                self.user,
+            ),
+        ):
+            write()
+            self.assertEqual(TaskSnapshot.objects.get(task_id=linked_task_id).data, self.get_task_data(linked_task_id))
+            self.assertEqual(self.task_manager.get_data(linked_task_id, self.user), self.get_task_data(linked_task_id))
+
+    def test_save_snapshots_updates_existing_snapshot(self):
+        task_id = self.create_task()
+        snapshot = TaskSnapshot.objects.get(task_id=task_id)
+
+        self.task_manager.refresh_snapshots([task_id])
+
+        self.assertEqual(TaskSnapshot.objects.get(task_id=task_id).pk, snapshot.pk)
+
+    def save_concurrent_snapshot(self, task_id: int, data: dict):
+        # Stands for a task write that saves a newer snapshot while a reader or a rebuild builds the task data.
+        get_task_data_storage = task_data_builder.get_task_data_storage
+
+        def save_snapshot(task_record_table):
+            TaskSnapshot.objects.update_or_create(
+                task_id=task_id,
+                defaults={"project_schema": self.project_schema, "data": data, "updated": timezone.now()},
+            )
+            return get_task_data_storage(task_record_table)
+
+        return mock.patch.object(task_data_builder, "get_task_data_storage", side_effect=save_snapshot)
+
+    def test_read_miss_does_not_replace_concurrent_snapshot(self):
+        task_ids = [self.create_task(), self.create_task()]
+        TaskSnapshot.objects.all().delete()
+
+        for get_data in (
+            lambda: self.task_manager.get_data(task_ids[0], self.user),
+            lambda: self.task_manager.get_many_data(task_ids, self.user),
+        ):
+            with self.subTest(get_data=get_data), self.save_concurrent_snapshot(task_ids[0], {"id": "concurrent"}):
+                get_data()
+            self.assertEqual(TaskSnapshot.objects.get(task_id=task_ids[0]).data, {"id": "concurrent"})
+            TaskSnapshot.objects.all().delete()
+
+    def test_rebuild_does_not_replace_concurrent_snapshot(self):
+        task_ids = [self.create_task(), self.create_task()]
+        TaskSnapshot.objects.update(data={})
+
+        with self.save_concurrent_snapshot(task_ids[0], {"id": "concurrent"}):
+            self.task_manager.rebuild_snapshots(task_ids)
+
+        self.assertEqual(TaskSnapshot.objects.get(task_id=task_ids[0]).data, {"id": "concurrent"})
+        self.assertEqual(TaskSnapshot.objects.get(task_id=task_ids[1]).data, self.get_task_data(task_ids[1]))
+
+
+@override_settings(SHARK_TASK_EVENT_DISPATCH_WORKERS=0)
+class TaskEventDispatcherTestCase(TaskTestCase):
+    def enqueue_task_created_event(self) -> TaskEventDelivery:
+        task_events = list(TaskEvent.objects.filter(task_id=self.create_task()))
+        return task_event_dispatcher.enqueue(task_events, self.user, [{"class": "listener"}])[0]
+
+    @mock.patch("django_shark_task.task.event_dispatcher.notify_event_listener")
+    @mock.patch("django_shark_task.task.event_dispatcher.create_plugin_instance")
+    def test_delivered_delivery_is_deleted(self, create_plugin_instance, notify_event_listener):
+        delivery = self.enqueue_task_created_event()
+
+        self.assertTrue(task_event_dispatcher.deliver(delivery.pk))
+        notify_event_listener.assert_called_once()
+        self.assertFalse(TaskEventDelivery.objects.filter(pk=delivery.pk).exists())
+
+    @mock.patch("django_shark_task.task.event_dispatcher.notify_event_listener", side_effect=ValueError("Failed"))
+    @mock.patch("django_shark_task.task.event_dispatcher.create_plugin_instance")
+    def test_failed_delivery_is_logged_and_retried(self, create_plugin_instance, notify_event_listener):
+        delivery = self.enqueue_task_created_event()
+
+        with self.assertLogs("django_shark_task.task.event_dispatcher", "ERROR"):
+            self.assertTrue(task_event_dispatcher.deliver(delivery.pk))
+        delivery.refresh_from_db()
+        self.assertEqual(delivery.status, TaskEventDeliveryStatus.PENDING)
+        self.assertEqual(delivery.error, "Failed")
+
+    def test_task_events_are_enqueued_with_ids_without_bulk_insert_returning(self):
+        task_id = self.create_task()
+        with mock.patch.object(
+            type(connection.features),
+            "can_return_rows_from_bulk_insert",
+            new_callable=mock.PropertyMock,
+            return_value=False,
+        ), mock.patch.object(task_event_dispatcher, "enqueue") as enqueue:
+            self.task_manager.update(task_id, UpdateTaskInfo(summary="Updated", fields=[]), self.user)
+
+        task_events = enqueue.call_args.args[0]
+        self.assertEqual([task_event.type for task_event in task_events], [TaskEventType.SUMMARY_UPDATED])
+        self.assertIsNotNone(task_events[0].pk)
+
+
+class TaskCacheInfoTestCase(TaskTestCase):
+    def test_etag_changes_on_linked_task_write(self):
+        task_id = self.create_task()
+        linked_task_id = self.create_task("Linked task")
+        self.link_manager.create(self.link_type.pk, task_id, linked_task_id, self.user)
+        cache_info = self.task_manager.get_cache_info(task_id, self.user)
+
+        transition = self.task_manager.get_transitions(linked_task_id, self.user)[0]
+        self.task_manager.transit(linked_task_id, transition.pk, self.user)
+
+        self.assertNotEqual(self.task_manager.get_cache_info(task_id, self.user).etag, cache_info.etag)
+
+    def test_etag_changes_on_screen_change(self):
+        task_id = self.create_task()
+        cache_info = self.task_manager.get_cache_info(task_id, self.user)
+
+        ScreenField.objects.filter(screen=self.project_schema.screen).exclude(field=self.description_field).delete()
+        project_schema_cache.invalidate()
+
+        self.assertNotEqual(self.task_manager.get_cache_info(task_id, self.user).etag, cache_info.etag)
+
+
+class TaskDataTestCase(TaskTestCase):
+    def setUp(self):
+        super().setUp()
+        self.task_ids = [self.create_linked_task(link_count) for link_count in (0, 1, 3)]
+        self.task_manager.update(
+            self.task_ids[0],
+            UpdateTaskInfo(
+                summary="Task \u2028 é", fields=[{"id": self.description_field.pk, "value": {"value": "2em", "n": 0.5}}]
+            ),
+            self.user,
+        )
+
+    def get_reference_task_data(self, task_id: int) -> dict:
+        task = Task.objects.select_related("status__status_type", "creator").get(pk=task_id)
+        project_schema = project_schema_cache.get(task.project_schema_id)
+        field_value_storage = dict(task.field_values.values_list("field_id", "value"))
+        return TaskSerializer(
+            {
+                "id": task.pk,
+                "project_id": project_schema.project_id,
+                "task_type_id": project_schema.task_type_id,
+                "summary": task.summary,
+                "status": task.status,
+                "key": task.key,
+                "task_num": task.task_num,
+                "creator": task.creator,
+                "fields": [
+                    {"id": field_id, "value": field_value_storage.get(field_id)}
+                    for field_id in project_schema.field_storage
+                ],
+                "inward_links": [
+                    {
+                        "id": link.pk,
+                        "link_type_id": link.link_type_id,
+                        "linked_task": self.get_short_task(link.src_task),
+                    }
+                    for link in task.dest_links.select_related("src_task__creator").order_by("pk")
+                ],
+                "outward_links": [
+                    {
+                        "id": link.pk,
+                        "link_type_id": link.link_type_id,
+                        "linked_task": self.get_short_task(link.dest_task),
+                    }
+                    for link in task.src_links.select_related("dest_task__creator").order_by("pk")
+                ],
+                "created": task.created,
+                "updated": task.updated,
+            }
+        ).data
+
+    def get_short_task(self, task: Task) -> dict:
+        project_schema = project_schema_cache.get(task.project_schema_id)
+        return {
+            "id": task.pk,
+            "project_id": project_schema.project_id,
+            "task_type_id": project_schema.task_type_id,
+            "summary": task.summary,
+            "creator": task.creator,
+            "created": task.created,
+            "updated": task.updated,
+        }
+
+    def assertRenderedEqual(self, data, reference_data):
+        reference = JSONRenderer().render(reference_data)
+        self.assertEqual(JSONRenderer().render(data), reference)
+        self.assertEqual(ORJSONRenderer().render(data), reference)
+
+    def test_get_data_matches_serializer(self):
+        for snapshots_enabled in (False, True):
+            with self.subTest(snapshots_enabled=snapshots_enabled), self.settings(
+                SHARK_TASK_SNAPSHOTS=snapshots_enabled
+            ):
+                for task_id in self.task_ids:
+                    # The second read is served from the snapshot saved by the first one when snapshots are enabled.
+                    for _ in range(2):
+                        self.assertRenderedEqual(
+                            self.task_manager.get_data(task_id, self.user), self.get_reference_task_data(task_id)
+                        )
+
+    def test_get_many_data_matches_serializer(self):
+        missing_task_id = max(self.task_ids) + 1000
+        self.assertRenderedEqual(
+            self.task_manager.get_many_data(self.task_ids + [missing_task_id], self.user),
+            [{"id": task_id, "task": self.get_reference_task_data(task_id), "error": None} for task_id in self.task_ids]
+            + [{"id": missing_task_id, "task": None, "error": f"Task with id {missing_task_id} not found"}],
+        )
+
+    def test_filter_task_data_matches_serializer(self):
+        filter_info = TaskFilterInfo(project_id=self.project.pk, limit=3)
+        tasks = list(Task.objects.select_related("creator").filter(project=self.project).order_by("-created", "-pk"))
+        self.assertRenderedEqual(
+            self.task_manager.filter_task_data(filter_info, self.user),
+            {
+                "tasks": ShortTaskSerializer([self.get_short_task(task) for task in tasks[:3]], many=True).data,
+                "next_cursor": encode_cursor(tasks[2].created, tasks[2].pk),
+            },
+        )
+
+    def test_task_info_api_matches_data(self):
+        missing_task_id = max(self.task_ids) + 1000
+        for task_id in self.task_ids:
+            self.assertRenderedEqual(
+                TaskSerializer(self.task_manager.get(task_id, self.user).dict()).data,
+                self.task_manager.get_data(task_id, self.user),
+            )
+        self.assertRenderedEqual(
+            [
+                {
+                    "id": task_result_info.id,
+                    "task": TaskSerializer(task_result_info.task.dict()).data if task_result_info.task else None,
+                    "error": task_result_info.error,
+                }
+                for task_result_info in self.task_manager.get_many(self.task_ids + [missing_task_id], self.user)
+            ],
+            self.task_manager.get_many_data(self.task_ids + [missing_task_id], self.user),
+        )
+        filter_info = TaskFilterInfo(project_id=self.project.pk, limit=3)
+        short_task_page_info = self.task_manager.filter_task(filter_info, self.user)
+        self.assertRenderedEqual(
+            {
+                "tasks": ShortTaskSerializer(short_task_page_info.dict()["tasks"], many=True).data,
+                "next_cursor": short_task_page_info.next_cursor,
+            },
+            self.task_manager.filter_task_data(filter_info, self.user),
+        )
+
+    def test_search_task_data_matches_serializer(self):
+        search_info = TaskSearchInfo(project_id=self.project.pk, query="Linked", limit=2)
+        task_search_page_data = self.task_manager.search_task_data(search_info, self.user)
+        self.assertEqual((len(task_search_page_data["tasks"]), task_search_page_data["next_offset"]), (2, 2))
+        self.assertRenderedEqual(
+            task_search_page_data,
+            TaskSearchPageSerializer(self.task_manager.search_tasks(search_info, self.user).dict()).data,
+        )
+
+    def test_get_link_graph_data_matches_serializer(self):
+        filter_info = LinkGraphFilterInfo(task_id=self.task_ids[-1], direction=LinkDirection.BOTH)
+        link_graph_data = self.task_manager.get_link_graph_data(filter_info, self.user)
+        self.assertEqual(len(link_graph_data["nodes"]), 4)
+        self.assertRenderedEqual(
+            link_graph_data, LinkGraphSerializer(self.task_manager.get_link_graph(filter_info, self.user).dict()).data
+        )
+
+    @tag("benchmark")
+    @skipUnless(os.environ.get("SHARK_TASK_BENCHMARKS"), "Set SHARK_TASK_BENCHMARKS=1 to run benchmarks")
+    def test_get_data_is_faster_than_serializer(self):
+        task_id = self.task_ids[-1]
+        renderer = ORJSONRenderer()
+        serializer_time = min(
+            timeit.repeat(lambda: JSONRenderer().render(self.get_reference_task_data(task_id)), number=20, repeat=3)
+        )
+        builder_time = min(
+            timeit.repeat(lambda: renderer.render(self.task_manager.get_data(task_id, self.user)), number=20, repeat=3)
+        )
+        self.assertLess(builder_time, serializer_time)
+
+    @tag("benchmark")
+    @skipUnless(os.environ.get("SHARK_TASK_BENCHMARKS"), "Set SHARK_TASK_BENCHMARKS=1 to run benchmarks")
+    def test_filter_task_data_is_faster_than_serializer(self):
+        for index in range(50):
+            self.create_task(f"Task {index}")
+        filter_info = TaskFilterInfo(project_id=self.project.pk)
+        renderer = ORJSONRenderer()
+
+        def render_reference_page():
+            tasks = Task.objects.select_related("creator").filter(project=self.project).order_by("-created", "-pk")
+            return JSONRenderer().render(
+                ShortTaskSerializer([self.get_short_task(task) for task in tasks[: filter_info.limit]], many=True).data
+            )
+
+        serializer_time = min(timeit.repeat(render_reference_page, number=20, repeat=3))
+        builder_time = min(
+            timeit.repeat(
+                lambda: renderer.render(self.task_manager.filter_task_data(filter_info, self.user)), number=20, repeat=3
+            )
+        )
+        self.assertLess(builder_time, serializer_time)
+
+
+class ORJSONRendererTestCase(TestCase):
+    def test_render_matches_json_renderer(self):
+        for data in (
+            {"value": "2em", "n": 0.0001},
+            {"value": 1.5e-05},
+            {"value": [1e16, 0.1]},
+            {"value": "\u2028\u2029"},
+        ):
+            with self.subTest(data=data):
+                self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_render_uses_orjson_for_text_that_looks_like_exponent(self):
+        with mock.patch.object(JSONRenderer, "render") as render:
+            ORJSONRenderer().render({"value": "2em", "width": "1e3px"})
+        render.assert_not_called()
+
+    def test_render_falls_back_for_non_finite_float(self):
+        with self.assertRaises(ValueError):
+            ORJSONRenderer().render({"value": float("nan")})
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "metadata": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "metadata"},
+    },
+    SHARK_TASK_METADATA_CACHE="metadata",
+)
+class VersionedCacheTestCase(TestCase):
+    def test_get_version_keeps_shared_version_in_process(self):
+        versioned_cache = VersionedCache("test")
+        version = versioned_cache.get_version()
+        caches["metadata"].incr("shark_task:test:version")
+
+        self.assertEqual(versioned_cache.get_version(), version)
+        with mock.patch.object(time, "monotonic", return_value=time.monotonic() + 60):
+            self.assertEqual(versioned_cache.get_version(), version + 1)
+
+    def test_invalidate_does_not_restart_evicted_version(self):
+        caches["metadata"].set("shark_task:test:version", 1, timeout=None)
+        versioned_cache = VersionedCache("test")
+        versioned_cache.get("key", lambda _: "old")
+        caches["metadata"].delete("shark_task:test:version")
+
+        versioned_cache.invalidate()
+
+        self.assertGreater(versioned_cache.get_version(), 1)
+        self.assertEqual(VersionedCache("test").get("key", lambda _: "new"), "new")
+
+
+class TaskEventStreamTestCase(TaskTestCase):
+    @mock.patch.object(get_task_events.cls, "authentication_classes", [SessionAuthentication])
+    def test_stream_lines_are_rendered_like_json_responses(self):
+        task_id = self.create_task()
+        self.task_manager.update(task_id, UpdateTaskInfo(summary="Task \u2028 é", fields=[]), self.user)
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse("task_events_view", args=[task_id]), {"stream": True})
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        content = b"".join(response.streaming_content)
+        task_events = TaskEvent.objects.filter(task_id=task_id).order_by("-created", "-pk")
+        self.assertEqual(
+            content,
+            b"".join(JSONRenderer().render(TaskEventSerializer(task_event).data) + b"\n" for task_event in task_events),
+        )
+        self.assertIn("é".encode(), content)
+
+
+@override_settings(SHARK_TASK_ACTIVITY_SETTLE_TIME=0)
+class ProjectActivityTestCase(TaskTestCase):
+    async def test_get_project_activity_wakes_up_on_notify(self):
+        task_id = await sync_to_async(self.create_task)()
+        after = (await TaskEvent.objects.filter(project=self.project).alatest("pk")).pk
+
+        async def create_task_event():
+            await asyncio.sleep(0.1)
+            await TaskEvent.objects.acreate(
+                task_id=task_id, project=self.project, type=TaskEventType.SUMMARY_UPDATED, user=self.user
+            )
+            activity_notifier.notify([self.project.pk])
+
+        started = time.monotonic()
+        project_activity_page_info, _ = await asyncio.gather(
+            self.task_manager.get_project_activity(
+                ProjectActivityFilterInfo(project_id=self.project.pk, after=after, wait=5), self.user
+            ),
+            create_task_event(),
+        )
+
+        self.assertLess(time.monotonic() - started, PROJECT_ACTIVITY_POLL_INTERVAL)
+        self.assertEqual(
+            [task_event.type for task_event in project_activity_page_info.events], [TaskEventType.SUMMARY_UPDATED]
+        )
+
+    @override_settings(SHARK_TASK_ACTIVITY_SETTLE_TIME=60)
+    def test_get_project_activity_stops_at_unsettled_event(self):
+        task_id = self.create_task()
+        after = TaskEvent.objects.filter(project=self.project).latest("pk").pk
+        task_events = TaskEvent.objects.bulk_create(
+            TaskEvent(task_id=task_id, project=self.project, type=TaskEventType.SUMMARY_UPDATED, user=self.user)
+            for _ in range(3)
+        )
+        TaskEvent.objects.filter(pk__in=[task_events[0].pk, task_events[2].pk]).update(
+            created=timezone.now() - timedelta(minutes=5)
+        )
+
+        project_activity_page_info = async_to_sync(self.task_manager.get_project_activity)(
+            ProjectActivityFilterInfo(project_id=self.project.pk, after=after), self.user
+        )
+
+        self.assertEqual([task_event.pk for task_event in project_activity_page_info.events], [task_events[0].pk])
+        self.assertEqual(project_activity_page_info.next_cursor, task_events[0].pk)
+
+    @mock.patch.object(ProjectActivityView, "authentication_classes", [SessionAuthentication])
+    async def test_project_activity_view(self):
+        await sync_to_async(self.create_task)()
+        url = reverse("project_activity_view", args=[self.project.pk])
+
+        self.assertEqual((await self.async_client.get(url)).status_code, 403)
+
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(url, {"limit": 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["events"]), 1)
+        self.assertEqual((await self.async_client.get(url, {"limit": 0})).status_code, 400)
+        self.assertEqual((await self.async_client.options(url)).status_code, 200)
+        self.assertEqual((await self.async_client.post(url)).status_code, 405)
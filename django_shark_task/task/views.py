@@ -1,27 +1,56 @@
+import inspect
+
+from asgiref.sync import sync_to_async
+from django.db.models import Count, Max
+from django.http import StreamingHttpResponse
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from django_shark_task.fields.models import ScreenField
-from django_shark_task.fields.serializers import ScreenFieldSerializer
-from django_shark_task.task.link_manager import LinkManager
-from django_shark_task.task.models import LinkType, Task, TaskEvent
+from django_shark_task.task.const import METADATA_CACHE_MAX_AGE
+from django_shark_task.task.link_manager import CreateLinkInfo, LinkManager
+from django_shark_task.task.models import LinkType, Task
+from django_shark_task.task.project_schema_cache import project_schema_cache
 from django_shark_task.task.serializers import (
+    BulkCreateLinkSerializer,
+    BulkCreateTaskSerializer,
+    BulkDeleteLinkSerializer,
+    BulkLinkResultSerializer,
+    BulkTaskResultSerializer,
+    BulkTransitTaskSerializer,
     CreateLinkSerializer,
     CreateTaskSerializer,
     LinkSerializer,
     LinkTypeSerializer,
+    ProjectActivityPageSerializer,
+    RequestLinkGraphSerializer,
+    RequestProjectActivitySerializer,
+    RequestTaskBatchSerializer,
+    RequestTaskEventListSerializer,
     RequestTaskListSerializer,
-    ShortTaskSerializer,
+    RequestTaskSearchSerializer,
+    TaskEventPageSerializer,
     TaskEventSerializer,
     TaskSerializer,
+    TransitResultSerializer,
     TransitTaskSerializer,
     UpdateTaskSerializer,
 )
-from django_shark_task.task.task_manager import CreateTaskInfo, TaskManager, UpdateTaskInfo
-from django_shark_task.workflow.models import Transition
+from django_shark_task.task.task_manager import (
+    CreateTaskInfo,
+    LinkGraphFilterInfo,
+    ProjectActivityFilterInfo,
+    TaskEventFilterInfo,
+    TaskFilterInfo,
+    TaskManager,
+    TaskSearchInfo,
+    UpdateTaskInfo,
+)
+from django_shark_task.utils.http import conditional_response, make_weak_etag
 from django_shark_task.workflow.serializers import TransitionSerializer
+from django_shark_task.workflow.workflow_cache import workflow_cache
 
 
 class TaskView(APIView):
@@ -53,8 +82,13 @@ class TaskView(APIView):
 
     def get(self, request, task_id):
         task_manager = TaskManager()
-        task_info = task_manager.get(task_id, request.user)
-        return Response(TaskSerializer(task_info.dict()).data)
+        task_cache_info = task_manager.get_cache_info(task_id, request.user)
+        return conditional_response(
+            request,
+            task_cache_info.etag,
+            task_cache_info.last_modified,
+            lambda: task_manager.get_data(task_id, request.user),
+        )
 
     def delete(self, request, task_id):
         try:
@@ -66,43 +100,149 @@ class TaskView(APIView):
             raise e
 
 
+class BulkTaskView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        try:
+            serializer = BulkCreateTaskSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            task_manager = TaskManager()
+            create_task_info_list = [CreateTaskInfo(**task_data) for task_data in serializer.data["tasks"]]
+            result_info_list = task_manager.bulk_create(create_task_info_list, request.user)
+            return Response(
+                BulkTaskResultSerializer([result_info.dict() for result_info in result_info_list], many=True).data
+            )
+        except Exception as e:
+            print(e)
+            raise e
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def get_tasks(request):
+    serializer = RequestTaskBatchSerializer(data=request.GET)
+    serializer.is_valid(raise_exception=True)
+    task_manager = TaskManager()
+    return Response(task_manager.get_many_data(serializer.validated_data["ids"], request.user))
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def filter_tasks(request):
     serializer = RequestTaskListSerializer(data=request.GET)
     serializer.is_valid(raise_exception=True)
     task_manager = TaskManager()
-    task_info_list = task_manager.filter_task(serializer.data["project_id"])
-    return Response(ShortTaskSerializer([task_info.dict() for task_info in task_info_list], many=True).data)
+    return Response(task_manager.filter_task_data(TaskFilterInfo(**serializer.validated_data), request.user))
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def search_tasks(request):
+    serializer = RequestTaskSearchSerializer(data=request.GET)
+    serializer.is_valid(raise_exception=True)
+    task_manager = TaskManager()
+    return Response(task_manager.search_task_data(TaskSearchInfo(**serializer.validated_data), request.user))
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def get_task_events(request, task_id: int):
-    return Response(TaskEventSerializer(TaskEvent.objects.filter(task_id=task_id).order_by("-created"), many=True).data)
+    serializer = RequestTaskEventListSerializer(data=request.GET)
+    serializer.is_valid(raise_exception=True)
+    filter_data = dict(serializer.validated_data)
+    is_stream = filter_data.pop("stream")
+    filter_info = TaskEventFilterInfo(task_id=task_id, **filter_data)
+    task_manager = TaskManager()
+    if is_stream:
+        task_events = task_manager.iter_task_events(filter_info, request.user)
+        # Lines are rendered like JSON responses, with the negotiated renderer when it renders JSON.
+        renderer = request.accepted_renderer if isinstance(request.accepted_renderer, JSONRenderer) else JSONRenderer()
+        return StreamingHttpResponse(
+            (renderer.render(TaskEventSerializer(task_event).data) + b"\n" for task_event in task_events),
+            content_type="application/x-ndjson",
+        )
+    task_event_page_info = task_manager.get_task_events(filter_info, request.user)
+    return Response(TaskEventPageSerializer(task_event_page_info.dict()).data)
+
+
+class ProjectActivityView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    # APIView.dispatch is synchronous, so a long poll would hold a worker thread for the whole wait. This dispatch runs
+    # the same steps but awaits async handlers such as get; inherited handlers such as options stay synchronous.
+    # Authentication and permission checks run in a thread.
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if inspect.isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def get(self, request, project_id: int):
+        serializer = RequestProjectActivitySerializer(data=request.GET)
+        serializer.is_valid(raise_exception=True)
+        task_manager = TaskManager()
+        project_activity_page_info = await task_manager.get_project_activity(
+            ProjectActivityFilterInfo(project_id=project_id, **serializer.validated_data), request.user
+        )
+        return Response(ProjectActivityPageSerializer(project_activity_page_info.dict()).data)
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def get_task_fields(request, task_id: int):
-    task = Task.objects.select_related("project_schema").get(pk=task_id)
-    screen_fields = ScreenField.objects.filter(screen_id=task.project_schema.screen_id).order_by("priority")
-    return Response(ScreenFieldSerializer(screen_fields, many=True).data)
+    project_schema = project_schema_cache.get(Task.objects.values_list("project_schema_id", flat=True).get(pk=task_id))
+    return conditional_response(
+        request,
+        project_schema.screen_etag,
+        project_schema.screen_last_modified,
+        lambda: project_schema.serialized_screen_fields,
+        max_age=METADATA_CACHE_MAX_AGE,
+    )
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def get_task_workflow(request, task_id: int):
-    task = Task.objects.select_related("project_schema").get(pk=task_id)
-    transitions = Transition.objects.filter(workflow_id=task.project_schema.workflow_id)
-    return Response(TransitionSerializer(transitions, many=True).data)
+    project_schema = project_schema_cache.get(Task.objects.values_list("project_schema_id", flat=True).get(pk=task_id))
+    workflow = workflow_cache.get(project_schema.workflow_id)
+    return conditional_response(
+        request,
+        workflow.etag,
+        workflow.last_modified,
+        lambda: workflow.serialized_transitions,
+        max_age=METADATA_CACHE_MAX_AGE,
+    )
 
 
 class LinkTypeView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        return Response(LinkTypeSerializer(LinkType.objects.all(), many=True).data)
+        link_type_info = LinkType.objects.aggregate(count=Count("pk"), last_modified=Max("updated"))
+        return conditional_response(
+            request,
+            make_weak_etag("link_types", link_type_info["count"], link_type_info["last_modified"]),
+            link_type_info["last_modified"],
+            lambda: LinkTypeSerializer(LinkType.objects.all(), many=True).data,
+            max_age=METADATA_CACHE_MAX_AGE,
+        )
 
 
 class LinkView(APIView):
@@ -122,6 +262,43 @@ class LinkView(APIView):
         return Response(f"Link with id {link_id} deleted")
 
 
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def get_link_graph(request, task_id: int):
+    serializer = RequestLinkGraphSerializer(data=request.GET)
+    serializer.is_valid(raise_exception=True)
+    task_manager = TaskManager()
+    return Response(
+        task_manager.get_link_graph_data(
+            LinkGraphFilterInfo(task_id=task_id, **serializer.validated_data), request.user
+        )
+    )
+
+
+class BulkLinkView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = BulkCreateLinkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        link_manager = LinkManager()
+        result_info_list = link_manager.bulk_create(
+            [CreateLinkInfo(**link_data) for link_data in serializer.validated_data["links"]], request.user
+        )
+        return Response(
+            BulkLinkResultSerializer([result_info.dict() for result_info in result_info_list], many=True).data
+        )
+
+    def delete(self, request):
+        serializer = BulkDeleteLinkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        link_manager = LinkManager()
+        result_info_list = link_manager.bulk_delete(serializer.validated_data["ids"], request.user)
+        return Response(
+            BulkLinkResultSerializer([result_info.dict() for result_info in result_info_list], many=True).data
+        )
+
+
 class TransitTaskView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -131,8 +308,7 @@ class TransitTaskView(APIView):
             serializer.is_valid(raise_exception=True)
             task_manager = TaskManager()
             task_manager.transit(task_id, serializer.data["transition_id"], request.user)
-            task_info = task_manager.get(task_id)
-            return Response(TaskSerializer(task_info.dict()).data)
+            return Response(task_manager.get_data(task_id, request.user))
         except Exception as e:
             print(e)
             raise e
@@ -141,3 +317,24 @@ class TransitTaskView(APIView):
         task_manager = TaskManager()
         transitions = task_manager.get_transitions(task_id, request.user)
         return Response(TransitionSerializer(transitions, many=True).data)
+
+
+class BulkTransitTaskView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        try:
+            serializer = BulkTransitTaskSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            task_manager = TaskManager()
+            transit_result_info_list = task_manager.bulk_transit(
+                serializer.validated_data["task_ids"], serializer.validated_data["transition_id"], request.user
+            )
+            return Response(
+                TransitResultSerializer(
+                    [transit_result_info.dict() for transit_result_info in transit_result_info_list], many=True
+                ).data
+            )
+        except Exception as e:
+            print(e)
+            raise e
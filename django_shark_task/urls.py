@@ -1,25 +1,39 @@
 from django.urls import path
 
 from django_shark_task.task.views import (
+    BulkLinkView,
+    BulkTaskView,
+    BulkTransitTaskView,
     LinkTypeView,
     LinkView,
+    ProjectActivityView,
     TaskView,
     TransitTaskView,
     filter_tasks,
+    get_link_graph,
     get_task_events,
     get_task_fields,
     get_task_workflow,
+    get_tasks,
+    search_tasks,
 )
 
 urlpatterns = [
     path("task/", TaskView.as_view(), name="task_views"),
     path("task/<int:task_id>/", TaskView.as_view(), name="task_views"),
+    path("task/bulk/", BulkTaskView.as_view(), name="bulk_task_view"),
+    path("tasks/", get_tasks, name="tasks_view"),
     path("filter_tasks/", filter_tasks, name="filter_task_view"),
+    path("search_tasks/", search_tasks, name="search_tasks_view"),
     path("task_events/<int:task_id>/", get_task_events, name="task_events_view"),
+    path("project_activity/<int:project_id>/", ProjectActivityView.as_view(), name="project_activity_view"),
     path("task_fields/<int:task_id>/", get_task_fields, name="task_fields_view"),
     path("task_workflow/<int:task_id>/", get_task_workflow, name="task_workflow_view"),
     path("link_type/", LinkTypeView.as_view(), name="link_type_view"),
     path("link/", LinkView.as_view(), name="link_view"),
     path("link/<int:link_id>/", LinkView.as_view(), name="link_view"),
+    path("link/bulk/", BulkLinkView.as_view(), name="bulk_link_view"),
+    path("link_graph/<int:task_id>/", get_link_graph, name="link_graph_view"),
     path("transit/<int:task_id>/", TransitTaskView.as_view(), name="transit_task_view"),
+    path("transit/bulk/", BulkTransitTaskView.as_view(), name="bulk_transit_task_view"),
 ]
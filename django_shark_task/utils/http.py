@@ -0,0 +1,33 @@
+import hashlib
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+
+def make_weak_etag(*parts) -> str:
+    return f'W/"{hashlib.sha1(":".join(str(part) for part in parts).encode()).hexdigest()}"'
+
+
+def get_max_updated(*updated_values: Optional[datetime]) -> Optional[datetime]:
+    return max((updated for updated in updated_values if updated is not None), default=None)
+
+
+def conditional_response(
+    request,
+    etag: str,
+    last_modified: Optional[datetime],
+    get_data: Callable[[], Any],
+    **cache_control,
+):
+    last_modified_timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified_timestamp)
+    if response is None:
+        response = Response(get_data())
+    response.headers["ETag"] = etag
+    if last_modified_timestamp is not None:
+        response.headers["Last-Modified"] = http_date(last_modified_timestamp)
+    patch_cache_control(response, private=True, **(cache_control or {"no_cache": True}))
+    return response
@@ -0,0 +1,31 @@
+import logging
+from datetime import datetime
+from typing import Hashable, Optional
+
+from jsonschema.exceptions import ValidationError
+from jsonschema.validators import validator_for
+
+logger = logging.getLogger(__name__)
+
+_validator_storage: dict[Hashable, tuple[Optional[datetime], object]] = {}
+
+
+def get_validator(key: Optional[Hashable], schema: dict, updated: Optional[datetime] = None):
+    validator_info = _validator_storage.get(key) if key is not None else None
+    if validator_info is None or validator_info[0] != updated:
+        validator_cls = validator_for(schema)
+        validator_cls.check_schema(schema)
+        validator_info = (updated, validator_cls(schema))
+        if key is not None:
+            _validator_storage[key] = validator_info
+    return validator_info[1]
+
+
+def validate(
+    value, key: Optional[Hashable], schema: dict, updated: Optional[datetime] = None, error_message: str = ""
+) -> None:
+    try:
+        get_validator(key, schema, updated).validate(value)
+    except ValidationError as e:
+        logger.error(e)
+        raise ValueError(error_message or str(e))
@@ -0,0 +1,16 @@
+import base64
+import json
+from datetime import datetime
+
+
+def encode_cursor(created: datetime, pk: int) -> str:
+    raw_cursor = json.dumps([created.isoformat(), pk])
+    return base64.urlsafe_b64encode(raw_cursor.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        return datetime.fromisoformat(created), int(pk)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor {cursor}") from e
@@ -0,0 +1,84 @@
+import importlib
+import json
+import threading
+from datetime import datetime
+from typing import Any, Hashable, Optional
+
+from pydantic.main import BaseModel
+
+_lock = threading.Lock()
+_class_storage: dict[str, type] = {}
+_instance_storage: dict[tuple[str, str], Any] = {}
+_plugin_info_list_storage: dict[Hashable, tuple[Optional[datetime], list["PluginInfo"]]] = {}
+
+
+class PluginInfo(BaseModel):
+    class_name: str
+    args: list
+    kwargs: dict
+    priority: int
+
+    class Config:
+        allow_mutation = False
+
+    def create_instance(self):
+        return create_plugin_instance(self.class_name, self.args, self.kwargs)
+
+
+def get_plugin_class(class_name: str) -> type:
+    cls = _class_storage.get(class_name)
+    if cls is None:
+        module_name, short_class_name = class_name.rsplit(".", 1)
+        cls = getattr(importlib.import_module(module_name), short_class_name)
+        with _lock:
+            _class_storage[class_name] = cls
+    return cls
+
+
+def create_plugin_instance(class_name: str, args: list, kwargs: dict):
+    cls = get_plugin_class(class_name)
+    if not getattr(cls, "is_stateless", False):
+        return cls(*args, **kwargs)
+
+    instance_key = (class_name, json.dumps([args, kwargs], sort_keys=True, default=str))
+    instance = _instance_storage.get(instance_key)
+    if instance is None:
+        instance = cls(*args, **kwargs)
+        with _lock:
+            _instance_storage[instance_key] = instance
+    return instance
+
+
+def compile_plugin_info_list(plugin_info_list: Optional[list[dict]]) -> list[PluginInfo]:
+    return sorted(
+        (
+            PluginInfo(
+                class_name=plugin_info["class"],
+                args=plugin_info.get("args", []),
+                kwargs=plugin_info.get("kwargs", {}),
+                priority=plugin_info["priority"],
+            )
+            for plugin_info in plugin_info_list or []
+        ),
+        key=lambda x: x.priority,
+    )
+
+
+def get_plugin_info_list(
+    key: Optional[Hashable], plugin_info_list: Optional[list[dict]], updated: Optional[datetime] = None
+) -> list[PluginInfo]:
+    compiled_info = _plugin_info_list_storage.get(key) if key is not None else None
+    if compiled_info is None or compiled_info[0] != updated:
+        compiled_info = (updated, compile_plugin_info_list(plugin_info_list))
+        if key is not None:
+            with _lock:
+                _plugin_info_list_storage[key] = compiled_info
+    return compiled_info[1]
+
+
+def validate_plugin_info_list(plugin_info_list: Optional[list[dict]], error_message: str) -> None:
+    for plugin_info in plugin_info_list or []:
+        try:
+            get_plugin_class(plugin_info["class"])
+        except (ImportError, AttributeError, ValueError) as e:
+            raise ValueError(f"{error_message}: {plugin_info['class']}") from e
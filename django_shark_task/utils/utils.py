@@ -1,29 +1,67 @@
-import importlib
-
 from django.contrib.auth import get_user_model
 
 from django_shark_task.task.models import Task, TaskEvent
+from django_shark_task.utils.plugins import create_plugin_instance
 
 User = get_user_model()
 
 
 class Condition:
+    is_stateless = False
+
     def is_active(self, task: Task, user: User) -> bool:
         ...
 
+    def is_active_many(self, tasks: list[Task], user: User) -> set[int]:
+        return {task.pk for task in tasks if self.is_active(task, user)}
+
 
 class Postfunction:
+    is_stateless = False
+
     def execute(self, task: Task, user: User) -> None:
         ...
         ...
 
+    def execute_many(self, tasks: list[Task], user: User) -> None:
+        for task in tasks:
+            self.execute(task, user)
+
 
 class EventListener:
+    is_stateless = False
+
     def notify(self, task: Task, task_events: list[TaskEvent], user: User) -> None:
         ...
 
+    def notify_many(self, tasks: list[Task], task_events: list[TaskEvent], user: User) -> None:
+        task_event_storage: dict[int, list[TaskEvent]] = {}
+        for task_event in task_events:
+            task_event_storage.setdefault(task_event.task_id, []).append(task_event)
+        for task in tasks:
+            if task.pk in task_event_storage:
+                self.notify(task, task_event_storage[task.pk], user)
+
 
 def create_instance(class_name: str, args: list, kwargs: dict):
-    module_name, class_name = class_name.rsplit(".", 1)
-    cls = getattr(importlib.import_module(module_name), class_name)
-    return cls(*args, **kwargs)
+    return create_plugin_instance(class_name, args, kwargs)
+
+
+def get_active_task_ids(condition, tasks: list[Task], user: User) -> set[int]:
+    if hasattr(condition, "is_active_many"):
+        return set(condition.is_active_many(tasks, user))
+    return Condition.is_active_many(condition, tasks, user)
+
+
+def execute_postfunction(postfunction, tasks: list[Task], user: User) -> None:
+    if hasattr(postfunction, "execute_many"):
+        postfunction.execute_many(tasks, user)
+    else:
+        Postfunction.execute_many(postfunction, tasks, user)
+
+
+def notify_event_listener(event_listener, tasks: list[Task], task_events: list[TaskEvent], user: User) -> None:
+    if hasattr(event_listener, "notify_many"):
+        event_listener.notify_many(tasks, task_events, user)
+    else:
+        EventListener.notify_many(event_listener, tasks, task_events, user)
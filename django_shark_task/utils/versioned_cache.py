@@ -0,0 +1,90 @@
+import threading
+import time
+from typing import Any, Callable, Hashable, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from django_shark_task.task.const import (
+    METADATA_CACHE_LOCAL_TIMEOUT,
+    METADATA_CACHE_VERSION_TIMEOUT,
+)
+
+
+class VersionedCache:
+    def __init__(self, name: str):
+        self._name = name
+        self._lock = threading.Lock()
+        self._version = 0
+        self._storage: dict[Hashable, tuple[int, Any]] = {}
+        self._expire_time_storage: dict[Hashable, float] = {}
+        self._shared_version_info: Optional[tuple[float, int]] = None
+
+    def get(self, key: Hashable, compile_value: Callable[[int], Any]) -> Any:
+        shared_cache = self._get_shared_cache()
+        if shared_cache is None and self._is_expired(key):
+            self._storage.pop(key, None)
+        version = self.get_version()
+        value_info = self._storage.get(key)
+        if value_info is None or value_info[0] != version:
+            shared_key = f"shark_task:{self._name}:{key}:{version}"
+            value_info = shared_cache.get(shared_key) if shared_cache else None
+            if value_info is None:
+                value_info = (version, compile_value(version))
+                if shared_cache:
+                    shared_cache.set(shared_key, value_info)
+            self._storage[key] = value_info
+            if shared_cache is None and (local_timeout := self._get_local_timeout()) is not None:
+                self._expire_time_storage[key] = time.monotonic() + local_timeout
+        return value_info[1]
+
+    def get_version(self) -> int:
+        # The shared version is kept in process for a short time, so reads do not make a cache round trip each.
+        if shared_cache := self._get_shared_cache():
+            shared_version_info = self._shared_version_info
+            if shared_version_info is None or shared_version_info[0] <= time.monotonic():
+                version = shared_cache.get_or_set(self._get_version_key(), self._get_version_seed, timeout=None)
+                shared_version_info = (time.monotonic() + self._get_version_timeout(), version)
+                self._shared_version_info = shared_version_info
+            return shared_version_info[1]
+        return self._version
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._storage = {}
+            self._shared_version_info = None
+        if shared_cache := self._get_shared_cache():
+            try:
+                shared_cache.incr(self._get_version_key())
+            except ValueError:
+                # The version was evicted. Entries of earlier versions may still be cached, so the version is seeded
+                # above any version used before instead of being restarted.
+                if not shared_cache.add(self._get_version_key(), self._get_version_seed(), timeout=None):
+                    shared_cache.incr(self._get_version_key())
+
+    def invalidate_on_commit(self) -> None:
+        self.invalidate()
+        transaction.on_commit(self.invalidate)
+
+    def _is_expired(self, key: Hashable) -> bool:
+        expire_time = self._expire_time_storage.get(key)
+        return expire_time is not None and expire_time <= time.monotonic()
+
+    def _get_local_timeout(self):
+        return getattr(settings, "SHARK_TASK_METADATA_CACHE_LOCAL_TIMEOUT", METADATA_CACHE_LOCAL_TIMEOUT)
+
+    def _get_version_timeout(self) -> float:
+        return getattr(settings, "SHARK_TASK_METADATA_CACHE_VERSION_TIMEOUT", METADATA_CACHE_VERSION_TIMEOUT)
+
+    def _get_version_seed(self) -> int:
+        return time.time_ns() // 1000
+
+    def _get_version_key(self) -> str:
+        return f"shark_task:{self._name}:version"
+
+    def _get_shared_cache(self):
+        if cache_alias := getattr(settings, "SHARK_TASK_METADATA_CACHE", None):
+            return caches[cache_alias]
+        return None
@@ -1,9 +1,7 @@
-import logging
-
-import jsonschema
 from django.db import models
-from jsonschema.exceptions import ValidationError
 
+from django_shark_task.utils.json_schema import validate
+from django_shark_task.utils.plugins import validate_plugin_info_list
 from django_shark_task.workflow.const import (
     TRANSITION_CONDITIONS_JSON_SCHEMA,
     TRANSITION_POSTFUNCIONS_JSON_SCHEMA,
@@ -49,19 +47,19 @@ class Transition(models.Model):
         ):
             raise ValueError("Only one transition in one workflow could be initial")
         if self.conditions:
-            try:
-                jsonschema.validate(self.conditions, TRANSITION_CONDITIONS_JSON_SCHEMA)
-            except ValidationError as e:
-                logger = logging.getLogger()
-                logger.error(e)
-                print(e)
-                raise ValueError("Invalid condition schema")
+            validate(
+                self.conditions,
+                "transition_conditions",
+                TRANSITION_CONDITIONS_JSON_SCHEMA,
+                error_message="Invalid condition schema",
+            )
+            validate_plugin_info_list(self.conditions, "Invalid condition class")
         if self.postfunctions:
-            try:
-                jsonschema.validate(self.postfunctions, TRANSITION_POSTFUNCIONS_JSON_SCHEMA)
-            except ValidationError as e:
-                logger = logging.getLogger()
-                logger.error(e)
-                print(e)
-                raise ValueError("Invalid postfunction schema")
+            validate(
+                self.postfunctions,
+                "transition_postfunctions",
+                TRANSITION_POSTFUNCIONS_JSON_SCHEMA,
+                error_message="Invalid postfunction schema",
+            )
+            validate_plugin_info_list(self.postfunctions, "Invalid postfunction class")
         return super().save(*args, **kwargs)
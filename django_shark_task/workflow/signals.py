@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+
+from django_shark_task.workflow.models import Status, StatusType, Transition, Workflow
+from django_shark_task.workflow.workflow_cache import workflow_cache
+
+
+def invalidate_workflow_cache(sender, **kwargs):
+    workflow_cache.invalidate_on_commit()
+
+
+for sender in (Workflow, Transition, Status, StatusType):
+    post_save.connect(invalidate_workflow_cache, sender=sender)
+    post_delete.connect(invalidate_workflow_cache, sender=sender)
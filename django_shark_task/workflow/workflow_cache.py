@@ -0,0 +1,112 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic.main import BaseModel
+
+from django_shark_task.utils.http import get_max_updated, make_weak_etag
+from django_shark_task.utils.versioned_cache import VersionedCache
+from django_shark_task.workflow.models import Status, Transition
+from django_shark_task.workflow.serializers import StatusSerializer, TransitionSerializer
+
+
+class CompiledWorkflow(BaseModel):
+    id: int
+    version: int
+    transition_storage: dict[int, Transition]
+    out_transition_id_storage: dict[int, list[int]]
+    global_transition_ids: list[int]
+    initial_transition_id: Optional[int]
+    serialized_transitions: list[dict]
+    serialized_status_storage: dict[int, dict]
+    etag: str
+    last_modified: Optional[datetime]
+
+    class Config:
+        arbitrary_types_allowed = True
+        allow_mutation = False
+
+    def get_out_transitions(self, status_id: int) -> list[Transition]:
+        transition_ids = self.out_transition_id_storage.get(status_id, self.global_transition_ids)
+        return [self.transition_storage[transition_id] for transition_id in transition_ids]
+
+    def get_out_transition(self, status_id: int, transition_id: int) -> Transition:
+        if transition_id not in self.out_transition_id_storage.get(status_id, self.global_transition_ids):
+            raise Transition.DoesNotExist(f"Transition {transition_id} is not available from status {status_id}")
+        return self.transition_storage[transition_id]
+
+    def get_serialized_status(self, status_id: int) -> dict:
+        if status_id in self.serialized_status_storage:
+            return self.serialized_status_storage[status_id]
+        return StatusSerializer(Status.objects.select_related("status_type").get(pk=status_id)).data
+
+
+class WorkflowCache:
+    def __init__(self):
+        self._cache = VersionedCache("workflow")
+
+    def get(self, workflow_id: int) -> CompiledWorkflow:
+        return self._cache.get(f"workflow:{workflow_id}", lambda version: self._compile(workflow_id, version))
+
+    def invalidate(self) -> None:
+        self._cache.invalidate()
+
+    def invalidate_on_commit(self) -> None:
+        self._cache.invalidate_on_commit()
+
+    def _compile(self, workflow_id: int, version: int) -> CompiledWorkflow:
+        transitions = list(
+            Transition.objects.select_related("src_status__status_type", "dest_status__status_type")
+            .filter(workflow_id=workflow_id)
+            .order_by("pk")
+        )
+
+        initial_transition_id = None
+        global_transition_ids: list[int] = []
+        out_transition_id_storage: dict[int, list[int]] = {}
+        for transition in transitions:
+            if transition.is_initial:
+                initial_transition_id = transition.pk
+            elif transition.src_status_id is None:
+                global_transition_ids.append(transition.pk)
+            else:
+                out_transition_id_storage.setdefault(transition.src_status_id, []).append(transition.pk)
+        out_transition_id_storage = {
+            status_id: sorted(transition_ids + global_transition_ids)
+            for status_id, transition_ids in out_transition_id_storage.items()
+        }
+        last_modified = get_max_updated(
+            *(
+                updated
+                for transition in transitions
+                for updated in (
+                    transition.updated,
+                    *(
+                        status_updated
+                        for status in (transition.src_status, transition.dest_status)
+                        if status is not None
+                        for status_updated in (status.updated, status.status_type.updated)
+                    ),
+                )
+            )
+        )
+
+        return CompiledWorkflow(
+            id=workflow_id,
+            version=version,
+            transition_storage={transition.pk: transition for transition in transitions},
+            out_transition_id_storage=out_transition_id_storage,
+            global_transition_ids=global_transition_ids,
+            initial_transition_id=initial_transition_id,
+            serialized_transitions=TransitionSerializer(transitions, many=True).data,
+            serialized_status_storage={
+                status.pk: StatusSerializer(status).data
+                for transition in transitions
+                for status in (transition.src_status, transition.dest_status)
+                if status is not None
+            },
+            etag=make_weak_etag("workflow", workflow_id, len(transitions), last_modified),
+            last_modified=last_modified,
+        )
+
+
+workflow_cache = WorkflowCache()